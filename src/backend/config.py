@@ -2,114 +2,156 @@
 Configuration module for Site Scout Lite.
 Loads environment variables from .env file and exports constants.
 """
+import functools
 import os
 import logging
-from dotenv import load_dotenv
+import pathlib
+import stat
+from typing import Optional
 
 # Logging setup (must be before using logger)
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 # Try multiple locations to find .env file
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(os.path.dirname(script_dir))
+# Resolve this file's location once and derive the directories from it
+_HERE = pathlib.Path(__file__).resolve()
+_PROJECT_ROOT = _HERE.parents[2]
+script_dir = str(_HERE.parent)
+project_root = str(_PROJECT_ROOT)
 current_working_dir = os.getcwd()
 
-# List of potential .env file locations (in order of preference)
-env_paths = [
-    os.path.join(current_working_dir, ".env"),  # Current working directory
-    os.path.join(project_root, ".env"),  # Project root (parent of src/backend)
-    os.path.join(script_dir, ".env"),  # Backend directory
-    os.path.join(os.path.dirname(project_root), ".env"),  # Parent of project root
-]
-
-# Also try the absolute path if we can determine the workspace root
-# This handles cases where the working directory might be different
+# Module-level sentinel so the .env search and load only run once per module
+# instance (importlib.reload re-executes this and loads again)
+_ENV_LOADED = False
 workspace_root = None
-try:
-    # Try to find the workspace root by looking for common project files
-    check_dir = project_root
+
+
+# Files whose presence marks a directory as the workspace root
+WORKSPACE_MARKERS = frozenset({"Dockerfile", "README.md", "pyproject.toml"})
+
+
+def _find_workspace_root() -> Optional[str]:
+    """Find the workspace root by looking for common project files"""
     max_depth = 5
-    depth = 0
-    while depth < max_depth and check_dir != os.path.dirname(check_dir):
-        if os.path.exists(os.path.join(check_dir, "Dockerfile")) or \
-           os.path.exists(os.path.join(check_dir, "README.md")):
-            workspace_root = check_dir
-            break
-        check_dir = os.path.dirname(check_dir)
-        depth += 1
+    for check_dir in (_PROJECT_ROOT, *_PROJECT_ROOT.parents)[:max_depth]:
+        # One directory listing per level instead of a stat per marker
+        try:
+            with os.scandir(check_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        if WORKSPACE_MARKERS & names:
+            return str(check_dir)
+    return None
+
+
+def _is_real_env(path: str) -> bool:
+    """
+    Check that path is an existing regular file named exactly .env
+    (so .env.example is never picked up), using a single stat call.
+    """
+    if os.path.basename(path) != ".env":
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode)
+
+
+def _build_env_candidates() -> list:
+    """
+    Build the ordered list of potential .env file locations.
+    Paths are normalized and deduplicated here, once, so the search
+    loop only has to probe them.
+    """
+    global workspace_root
+
+    # List of potential .env file locations (in order of preference)
+    env_paths = [
+        os.path.join(current_working_dir, ".env"),  # Current working directory
+        _PROJECT_ROOT / ".env",  # Project root (parent of src/backend)
+        _HERE.parent / ".env",  # Backend directory
+        _PROJECT_ROOT.parent / ".env",  # Parent of project root
+    ]
+
+    # Also try the absolute path if we can determine the workspace root
+    # This handles cases where the working directory might be different
+    try:
+        workspace_root = _find_workspace_root()
+        if workspace_root:
+            env_paths.insert(0, pathlib.Path(workspace_root) / ".env")  # Add to front of list
+    except Exception as e:
+        logger.debug("Could not determine workspace root: %s", e)
+
+    return list(dict.fromkeys(os.path.normpath(os.path.abspath(p)) for p in env_paths))
+
+
+ENV_CANDIDATE_PATHS = _build_env_candidates()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_env_path() -> Optional[str]:
+    """
+    Locate the .env file to load (never .env.example).
+    Memoized so the filesystem is only probed once per process.
     
+    Returns:
+        Normalized path to the .env file, or None if none was found
+    """
+    # Log what we're checking
+    logger.info("Looking for .env file. Current working directory: %s", current_working_dir)
+    logger.info("Project root (calculated): %s", project_root)
+
+    # Use the first location that exists
+    # IMPORTANT: Only load .env, never .env.example
+    for env_path in ENV_CANDIDATE_PATHS:
+        if _is_real_env(env_path):
+            return env_path
+        logger.info("  Checked (not found): %s", env_path)
+
+    # Fall back to searching the current directory and its parents
+    for check_dir in pathlib.Path(current_working_dir).resolve().parents[:10]:
+        env_file = str(check_dir / ".env")
+        if _is_real_env(env_file):
+            return env_file
+
+    logger.warning("⚠ No .env file found. Checked locations:")
+    for env_path in ENV_CANDIDATE_PATHS:
+        logger.warning("  ✗ %s", env_path)
+    logger.warning("  Current working directory: %s", current_working_dir)
+    logger.warning("  Project root: %s", project_root)
     if workspace_root:
-        workspace_env = os.path.join(workspace_root, ".env")
-        if workspace_env not in env_paths:
-            env_paths.insert(0, workspace_env)  # Add to front of list
-except Exception as e:
-    logger.debug(f"Could not determine workspace root: {e}")
-
-# Log what we're checking
-logger.info(f"Looking for .env file. Current working directory: {current_working_dir}")
-logger.info(f"Project root (calculated): {project_root}")
-
-# Try to load .env from the first location that exists
-# IMPORTANT: Only load .env, never .env.example
-env_loaded = False
-for env_path in env_paths:
-    normalized_path = os.path.normpath(os.path.abspath(env_path))
-    # Explicitly check it's .env and not .env.example
-    if normalized_path.endswith(".env.example"):
-        logger.debug(f"  Skipping .env.example: {normalized_path}")
-        continue
-    if os.path.exists(normalized_path) and normalized_path.endswith(".env"):
-        load_dotenv(normalized_path, override=True)
-        logger.info(f"✓ Loaded .env from: {normalized_path}")
-        env_loaded = True
-        break
-    else:
-        logger.info(f"  Checked (not found): {normalized_path}")
-
-# If still not found, try direct absolute path based on workspace
-if not env_loaded:
-    # Try the workspace path directly (for Windows OneDrive paths)
-    workspace_env_direct = os.path.normpath(os.path.join(project_root, ".env"))
-    # Make sure it's .env and not .env.example
-    if os.path.exists(workspace_env_direct) and workspace_env_direct.endswith(".env") and not workspace_env_direct.endswith(".env.example"):
-        load_dotenv(workspace_env_direct, override=True)
-        logger.info(f"✓ Loaded .env from direct path: {workspace_env_direct}")
-        env_loaded = True
-
-# If no .env file found in specific locations, try default behavior
-# But explicitly look for .env, not .env.example
-if not env_loaded:
-    # Try to find .env in current directory and parent directories
-    # But skip .env.example
-    check_dir = current_working_dir
-    max_depth = 10
-    depth = 0
-    while depth < max_depth and check_dir != os.path.dirname(check_dir):
-        env_file = os.path.join(check_dir, ".env")
-        env_example = os.path.join(check_dir, ".env.example")
-        
-        # Only load if .env exists and .env.example doesn't override it
-        if os.path.exists(env_file) and env_file != env_example:
-            load_dotenv(env_file, override=True)
-            logger.info(f"✓ Loaded .env using default search from: {env_file}")
-            env_loaded = True
-            break
-        check_dir = os.path.dirname(check_dir)
-        depth += 1
+        logger.warning("  Workspace root: %s", workspace_root)
+    logger.warning("  Make sure .env file (NOT .env.example) exists in the project root or current working directory.")
+    logger.warning("  .env.example is a template - copy it to .env and fill in your actual API keys.")
+    return None
+
+
+def _load_env_once() -> bool:
+    """
+    Load the .env file into the environment at most once.
     
-    if not env_loaded:
-        logger.warning(f"⚠ No .env file found. Checked locations:")
-        for env_path in env_paths:
-            normalized_path = os.path.normpath(env_path)
-            exists = os.path.exists(normalized_path) and not normalized_path.endswith(".env.example")
-            logger.warning(f"  {'✓' if exists else '✗'} {normalized_path}")
-        logger.warning(f"  Current working directory: {current_working_dir}")
-        logger.warning(f"  Project root: {project_root}")
-        if workspace_root:
-            logger.warning(f"  Workspace root: {workspace_root}")
-        logger.warning("  Make sure .env file (NOT .env.example) exists in the project root or current working directory.")
-        logger.warning("  .env.example is a template - copy it to .env and fill in your actual API keys.")
+    Returns:
+        True if a .env file has been loaded
+    """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return True
+
+    env_path = _find_env_path()
+    if env_path is None:
+        return False
+
+    from dotenv import load_dotenv
+    load_dotenv(env_path, override=True)
+    logger.info("✓ Loaded .env from: %s", env_path)
+    _ENV_LOADED = True
+    return True
+
+
+env_loaded = _load_env_once()
 
 # API Keys - loaded from environment variables
 # No fallback values - keys must be set in .env file or environment variables
@@ -133,7 +175,7 @@ if env_loaded:
         found_keys.append("TRAVELTIME_APP_ID")
     
     if found_keys:
-        logger.info(f"Found {len(found_keys)} API key(s) in environment: {', '.join(found_keys)}")
+        logger.info("Found %s API key(s) in environment: %s", len(found_keys), ', '.join(found_keys))
     else:
         logger.warning("⚠ .env file was loaded but no API keys were found.")
         logger.warning("  This might mean:")
@@ -151,12 +193,20 @@ if env_loaded:
 SAM_BASE_URL = "https://api.sam.gov/opportunities/v2/search"
 GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
+# On-disk geocode cache (SQLite) so paid lookups survive process restarts
+# Set GEOCODE_CACHE_PATH to an empty string to disable the disk cache
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", str(_PROJECT_ROOT / ".geocode_cache.sqlite3"))
+GEOCODE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+
+# Parallel geocode lookups per SAM.gov batch (geocoding is I/O bound)
+SAM_GEOCODE_PARALLELISM = max(1, int(os.getenv("SAM_GEOCODE_PARALLELISM", "8")))
+
 # NAICS codes for filtering SAM.gov opportunities
 # These represent:
 # - 327300: Cement Manufacturing
 # - 327320: Ready-Mix Concrete Manufacturing
 # - 238110: Poured Concrete Foundation and Structure Contractors
-NAICS_CODES = ["327300", "327320", "238110"]
+NAICS_CODES = frozenset(("327300", "327320", "238110"))
 
 # State filter - Virginia only
 # All SAM.gov results must be filtered to Virginia state
@@ -1,22 +1,141 @@
 """
 Google Geocoding API client for converting addresses to coordinates.
 """
-from typing import Optional, Tuple
-from collections import OrderedDict
-import requests
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import quote
+from typing import Dict, Iterable, Optional, Tuple
+from functools import lru_cache
+import orjson
 import logging
-from config import GOOGLE_MAPS_API_KEY, GOOGLE_GEOCODE_URL
+from config import (
+    GOOGLE_MAPS_API_KEY,
+    GOOGLE_GEOCODE_URL,
+    GEOCODE_CACHE_PATH,
+    GEOCODE_CACHE_TTL_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
 MAX_GEOCODE_CACHE_SIZE = 512
-_geocode_cache: "OrderedDict[str, Tuple[Optional[float], Optional[float]]]" = OrderedDict()
+
+# The API key is fixed for the process, so encode it into the URL once
+_GEOCODE_URL_WITH_KEY = f"{GOOGLE_GEOCODE_URL}?key={quote(GOOGLE_MAPS_API_KEY or '', safe='')}"
+
+_WS_RE = re.compile(r"\s+")
+
+# An address worth sending to Google has at least one word (e.g. a city or
+# state name) or is a bare ZIP code; anything else can't geocode usefully
+_PLAUSIBLE_ADDRESS_RE = re.compile(r"[A-Za-z]{2,}|^\d{5}(?:-\d{4})?$")
+
+# Addresses Google definitively couldn't resolve are remembered briefly so
+# the same bad input isn't re-billed within a single batch
+NEGATIVE_CACHE_TTL = 300  # seconds
+_NEGATIVE_STATUSES = frozenset({"ZERO_RESULTS", "INVALID_REQUEST"})
+_negative_cache: Dict[str, float] = {}
+
+
+@lru_cache(maxsize=1)
+def _get_session():
+    """
+    Shared session so batch lookups reuse keep-alive TLS connections.
+    Built on first use so importing this module doesn't pay for `requests`.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    return session
+
+
+def _open_disk_cache() -> Optional[sqlite3.Connection]:
+    """Open (and create if needed) the SQLite geocode cache, or None if disabled/unavailable"""
+    if not GEOCODE_CACHE_PATH:
+        return None
+    try:
+        conn = sqlite3.connect(GEOCODE_CACHE_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geo ("
+            "addr TEXT PRIMARY KEY, lat REAL NOT NULL, lng REAL NOT NULL, ts INTEGER NOT NULL)"
+        )
+        return conn
+    except sqlite3.Error as exc:
+        logger.warning("[Geocode] Disk cache unavailable at '%s': %s", GEOCODE_CACHE_PATH, exc)
+        return None
+
+
+# Opened on first lookup rather than at import, so importing this module
+# (e.g. under pytest) never creates the cache file
+_DISK_CACHE: Optional[sqlite3.Connection] = None
+_DISK_CACHE_OPENED = False
+_DISK_CACHE_LOCK = threading.Lock()
+
+
+def _disk_cache() -> Optional[sqlite3.Connection]:
+    """Return the disk cache connection, opening it on first use. Call with _DISK_CACHE_LOCK held."""
+    global _DISK_CACHE, _DISK_CACHE_OPENED
+    if not _DISK_CACHE_OPENED:
+        _DISK_CACHE = _open_disk_cache()
+        _DISK_CACHE_OPENED = True
+    return _DISK_CACHE
+
+
+def _disk_cache_get(address: str) -> Optional[Tuple[float, float]]:
+    if not GEOCODE_CACHE_PATH:
+        return None
+    min_ts = int(time.time()) - GEOCODE_CACHE_TTL_SECONDS
+    try:
+        with _DISK_CACHE_LOCK:
+            conn = _disk_cache()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT lat, lng FROM geo WHERE addr = ? AND ts >= ?", (address, min_ts)
+            ).fetchone()
+    except sqlite3.Error as exc:
+        logger.warning("[Geocode] Disk cache read failed: %s", exc)
+        return None
+    if row is None:
+        return None
+    logger.debug("[Geocode] Disk cache hit for '%s'", address)
+    return row[0], row[1]
+
+
+def _disk_cache_put(address: str, lat_lng: Tuple[float, float]) -> None:
+    if not GEOCODE_CACHE_PATH:
+        return
+    try:
+        with _DISK_CACHE_LOCK:
+            conn = _disk_cache()
+            if conn is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO geo (addr, lat, lng, ts) VALUES (?, ?, ?, ?)",
+                (address, lat_lng[0], lat_lng[1], int(time.time())),
+            )
+    except sqlite3.Error as exc:
+        logger.warning("[Geocode] Disk cache write failed: %s", exc)
+
+
+class _GeocodeMiss(Exception):
+    """Raised inside the cached lookup so failed geocodes are never cached."""
 
 
 def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
     """
     Use Google Geocoding to turn a freeform address string into (lat, lng).
-    Includes an in-memory LRU cache to avoid repeated lookups for the same address.
+    Includes an in-memory LRU cache backed by an on-disk SQLite cache to avoid
+    repeated (billed) lookups for the same address, even across restarts.
     """
     if not GOOGLE_MAPS_API_KEY:
         logger.error("GOOGLE_MAPS_API_KEY not set; cannot geocode addresses!")
@@ -26,62 +145,131 @@ def geocode_address(address: str) -> Tuple[Optional[float], Optional[float]]:
         logger.warning("Empty address provided for geocoding")
         return None, None
     
-    normalized_address = " ".join(address.strip().split())
+    normalized_address = _normalize_address(address)
+    
+    if not _PLAUSIBLE_ADDRESS_RE.search(normalized_address):
+        logger.debug("[Geocode] Skipping implausible address '%s'", normalized_address)
+        return None, None
+    
+    expires_at = _negative_cache.get(normalized_address)
+    if expires_at is not None:
+        if time.time() < expires_at:
+            logger.debug("[Geocode] Known-bad address '%s' (cached)", normalized_address)
+            return None, None
+        _negative_cache.pop(normalized_address, None)
+    
+    try:
+        return _geocode_cached(normalized_address)
+    except _GeocodeMiss:
+        return None, None
+
+
+@lru_cache(maxsize=1024)
+def _normalize_address(address: str) -> str:
+    """
+    Collapse runs of whitespace and lowercase so equivalent addresses share
+    a cache entry (Google geocoding is case-insensitive)
+    """
+    return _WS_RE.sub(" ", address).strip().lower()
+
+
+async def geocode_many(
+    addresses: Iterable[str],
+    concurrency: int = 8,
+) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """
+    Geocode many addresses concurrently with bounded parallelism.
     
-    if normalized_address in _geocode_cache:
-        _geocode_cache.move_to_end(normalized_address)
-        logger.debug(f"[Geocode] Cache hit for '{normalized_address}'")
-        return _geocode_cache[normalized_address]
+    Each lookup runs geocode_address in a worker thread, so results share
+    the LRU cache and the pooled session with single-address calls.
     
-    lat_lng = _call_google_geocode(normalized_address)
-    if lat_lng != (None, None):
-        _remember_geocode(normalized_address, lat_lng)
+    Args:
+        addresses: Freeform address strings (duplicates are looked up once)
+        concurrency: Maximum number of lookups in flight at once
+        
+    Returns:
+        Dictionary mapping each input address to its (lat, lng)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _lookup(address: str) -> Tuple[Optional[float], Optional[float]]:
+        async with semaphore:
+            return await asyncio.to_thread(geocode_address, address)
+    
+    unique_addresses = list(dict.fromkeys(addresses))
+    results = await asyncio.gather(*(_lookup(addr) for addr in unique_addresses))
+    return dict(zip(unique_addresses, results))
+
+
+@lru_cache(maxsize=MAX_GEOCODE_CACHE_SIZE)
+def _geocode_cached(address: str) -> Tuple[float, float]:
+    lat_lng = _disk_cache_get(address)
+    if lat_lng is not None:
+        return lat_lng
+    lat_lng = _call_google_geocode(address)
+    if lat_lng == (None, None):
+        raise _GeocodeMiss(address)
+    _disk_cache_put(address, lat_lng)
     return lat_lng
 
 
-def _remember_geocode(address: str, lat_lng: Tuple[Optional[float], Optional[float]]) -> None:
-    _geocode_cache[address] = lat_lng
-    _geocode_cache.move_to_end(address)
-    if len(_geocode_cache) > MAX_GEOCODE_CACHE_SIZE:
-        evicted_key, _ = _geocode_cache.popitem(last=False)
-        logger.debug(f"[Geocode] Cache evicted oldest entry '{evicted_key}'")
+def _remember_negative(address: str) -> None:
+    if len(_negative_cache) >= MAX_GEOCODE_CACHE_SIZE:
+        _negative_cache.clear()
+    _negative_cache[address] = time.time() + NEGATIVE_CACHE_TTL
+
+
+# Extra detail logged for non-OK Geocoding statuses: (level, message)
+_STATUS_DETAILS = {
+    "ZERO_RESULTS": (logging.WARNING, "  → Google couldn't find this address"),
+    "REQUEST_DENIED": (logging.ERROR, "  → API request denied! Check your GOOGLE_MAPS_API_KEY"),
+    "INVALID_REQUEST": (logging.ERROR, "  → Invalid request. Address: '%s'"),
+    "OVER_QUERY_LIMIT": (logging.ERROR, "  → Google API quota exceeded!"),
+}
+
+
+def _log_geocode_status(status: Optional[str], address: str, data: dict) -> None:
+    logger.warning("Google Geocoding returned status: %s for address: '%s'", status, address)
+    detail = _STATUS_DETAILS.get(status)
+    if detail is None:
+        return
+    level, message = detail
+    if status == "INVALID_REQUEST":
+        logger.log(level, message, address)
+    else:
+        logger.log(level, message)
+    if status == "REQUEST_DENIED":
+        logger.error("  → Error message: %s", data.get('error_message', 'No error message'))
 
 
 def _call_google_geocode(address: str) -> Tuple[Optional[float], Optional[float]]:
-    params = {
-        "address": address,
-        "key": GOOGLE_MAPS_API_KEY,
-    }
-    
+    import requests
+
     try:
-        resp = requests.get(GOOGLE_GEOCODE_URL, params=params, timeout=10)
+        resp = _get_session().get(_GEOCODE_URL_WITH_KEY, params={"address": address}, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except requests.exceptions.RequestException as exc:
-        logger.error(f"Network error calling Google Geocoding API: {exc}")
-        logger.error(f"  Address attempted: '{address}'")
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Network error calling Google Geocoding API: %s", exc)
+            logger.error("  Address attempted: '%s'", address)
         return None, None
     except Exception as exc:
-        logger.error(f"Unexpected error calling Google Geocoding: {exc}")
-        logger.error(f"  Address attempted: '{address}'")
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Unexpected error calling Google Geocoding: %s", exc)
+            logger.error("  Address attempted: '%s'", address)
         return None, None
     
     status = data.get("status")
     if status != "OK":
-        logger.warning(f"Google Geocoding returned status: {status} for address: '{address}'")
-        if status == "ZERO_RESULTS":
-            logger.warning("  → Google couldn't find this address")
-        elif status == "REQUEST_DENIED":
-            logger.error("  → API request denied! Check your GOOGLE_MAPS_API_KEY")
-            logger.error(f"  → Error message: {data.get('error_message', 'No error message')}")
-        elif status == "INVALID_REQUEST":
-            logger.error(f"  → Invalid request. Address: '{address}'")
-        elif status == "OVER_QUERY_LIMIT":
-            logger.error("  → Google API quota exceeded!")
+        if status in _NEGATIVE_STATUSES:
+            _remember_negative(address)
+        if logger.isEnabledFor(logging.WARNING):
+            _log_geocode_status(status, address, data)
         return None, None
     
     if not data.get("results"):
-        logger.warning(f"No results in geocoding response for address: '{address}'")
+        logger.warning("No results in geocoding response for address: '%s'", address)
         return None, None
     
     try:
@@ -2,15 +2,96 @@
 TravelTime Isochrones API client for generating drive-time polygons.
 Returns GeoJSON polygon format for isochrone visualization.
 """
+import asyncio
+import copy
 import logging
 import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import TRAVELTIME_API_KEY, TRAVELTIME_APP_ID
 
 logger = logging.getLogger(__name__)
 
+# Live isochrones are cached in-process, keyed on coordinates rounded to 5
+# decimals (~1 m) so repeat lookups for the same site share an entry. Drive
+# times shift slowly, so entries are served stale-while-revalidate: fresh for
+# a day, then returned immediately while a background refresh runs, and only
+# fetched synchronously once they're older than the max age
+ISOCHRONE_CACHE_SIZE = 1024
+ISOCHRONE_CACHE_TTL = 24 * 3600  # seconds an entry is served as fresh
+ISOCHRONE_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds a stale entry may still be served
+_isochrone_cache: "OrderedDict[Tuple[float, float, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_isochrone_cache_lock = threading.Lock()
+
+# TravelTime requests currently in flight, keyed like the cache, so concurrent
+# callers asking for the same isochrone share one request
+_inflight: Dict[Tuple[float, float, int], Future] = {}
+_inflight_lock = threading.Lock()
+
+# Cache keys with a background refresh queued or running (guarded by
+# _inflight_lock), so repeat hits on a stale entry queue only one refresh
+_refreshing: set = set()
+
+# Background refreshes of stale cache entries (created on first use)
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = threading.Lock()
+
+# Mock isochrones are circles sampled at _MOCK_NUM_POINTS + 1 angles (the last
+# sample closes the ring); the unit-circle (cos, sin) pairs are computed once
+_MOCK_NUM_POINTS = 32  # More points = smoother circle
+_MOCK_UNIT_CIRCLE = tuple(
+    (math.cos(2 * math.pi * i / _MOCK_NUM_POINTS), math.sin(2 * math.pi * i / _MOCK_NUM_POINTS))
+    for i in range(_MOCK_NUM_POINTS + 1)
+)
+
+# Live polygons are simplified (Ramer-Douglas-Peucker) before being returned;
+# 1e-4 degrees is ~11 m, well below what's visible at dashboard zoom levels.
+# Rings smaller than the minimum are returned as-is
+ISOCHRONE_SIMPLIFY_TOLERANCE = 1e-4
+ISOCHRONE_SIMPLIFY_MIN_POINTS = 64
+
+# Transportation mode sent with every arrival search (read-only; never mutated)
+_TRANSPORTATION = {"type": "driving"}
+
+# (connect, read) timeouts for TravelTime calls - fail fast if the host is
+# unreachable, but give large polygon responses time to arrive
+TRAVELTIME_TIMEOUT = (3.05, 30)
+
+# Shared session so repeated isochrone calls reuse keep-alive TLS connections
+# to api.traveltimeapp.com (time-map is a read-only POST, so it's safe to retry).
+# Read timeouts are not retried: each costs the full 30 s read timeout, and
+# single-flight callers waiting on the request would be held up for all of them
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+    ),
+))
+# Credentials are fixed for the process, so set them on the session once.
+# Polygon-heavy JSON compresses very well, so always ask for gzip (urllib3
+# decompresses transparently; brotli would need an extra package)
+_SESSION.headers.update({
+    "Content-Type": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "X-Application-Id": TRAVELTIME_APP_ID or "",
+    "X-Api-Key": TRAVELTIME_API_KEY or "",
+})
+
 
 def _point_in_polygon(lng: float, lat: float, polygon: list) -> bool:
     """
@@ -19,7 +100,9 @@ def _point_in_polygon(lng: float, lat: float, polygon: list) -> bool:
     Args:
         lng: Longitude of the point
         lat: Latitude of the point
-        polygon: List of [lng, lat] coordinate pairs forming a closed polygon
+        polygon: List of [lng, lat] coordinate pairs forming a polygon ring
+            (closed or open - a duplicate closing point is a zero-length
+            edge, which never crosses the ray)
         
     Returns:
         True if point is inside polygon, False otherwise
@@ -27,21 +110,19 @@ def _point_in_polygon(lng: float, lat: float, polygon: list) -> bool:
     if not polygon or len(polygon) < 3:
         return False
     
-    # Remove duplicate closing point if present
-    coords = polygon[:-1] if polygon[0] == polygon[-1] else polygon
-    
-    n = len(coords)
     inside = False
     
-    j = n - 1
-    for i in range(n):
-        xi, yi = coords[i]
-        xj, yj = coords[j]
-        
-        # Check if ray crosses edge
-        if ((yi > lat) != (yj > lat)) and (lng < (xj - xi) * (lat - yi) / (yj - yi) + xi):
-            inside = not inside
-        j = i
+    # Walk edges as (previous vertex, current vertex) pairs without copying the ring
+    xj, yj = polygon[-1]
+    for xi, yi in polygon:
+        # Check if ray crosses edge. The intersection test is the usual
+        # lng < x_intersect rearranged to avoid dividing by (yj - yi):
+        # the sign of the cross product tells which side of the edge we're on
+        if (yi > lat) != (yj > lat):
+            cross = (xj - xi) * (lat - yi) - (lng - xi) * (yj - yi)
+            if (cross > 0) if yj > yi else (cross < 0):
+                inside = not inside
+        xj, yj = xi, yi
     
     return inside
 
@@ -53,7 +134,8 @@ def _min_distance_to_polygon(lng: float, lat: float, polygon: list) -> float:
     Args:
         lng: Longitude of the point
         lat: Latitude of the point
-        polygon: List of [lng, lat] coordinate pairs forming a closed polygon
+        polygon: List of [lng, lat] coordinate pairs forming a polygon ring
+            (closed or open)
         
     Returns:
         Minimum distance in degrees
@@ -61,37 +143,101 @@ def _min_distance_to_polygon(lng: float, lat: float, polygon: list) -> float:
     if not polygon or len(polygon) < 3:
         return float('inf')
     
-    # Remove duplicate closing point if present
-    coords = polygon[:-1] if polygon[0] == polygon[-1] else polygon
-    
-    min_dist = float('inf')
-    n = len(coords)
+    # Compare squared distances and take a single square root at the end
+    min_dist_sq = float('inf')
     
-    for i in range(n):
-        # Get edge endpoints
-        x1, y1 = coords[i]
-        x2, y2 = coords[(i + 1) % n]
-        
+    # Walk edges as (previous vertex, current vertex) pairs without copying the ring
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
         # Calculate distance from point to line segment
         # Using simplified distance calculation (approximate for small distances)
         dx = x2 - x1
         dy = y2 - y1
+        px = lng - x1
+        py = lat - y1
+        length_sq = dx * dx + dy * dy
         
-        if dx == 0 and dy == 0:
+        if length_sq == 0:
             # Edge is a point
-            dist = math.sqrt((lng - x1) ** 2 + (lat - y1) ** 2)
+            dist_sq = px * px + py * py
         else:
             # Project point onto line segment
-            t = max(0, min(1, ((lng - x1) * dx + (lat - y1) * dy) / (dx * dx + dy * dy)))
-            proj_x = x1 + t * dx
-            proj_y = y1 + t * dy
+            t = (px * dx + py * dy) / length_sq
+            if t < 0:
+                t = 0
+            elif t > 1:
+                t = 1
+            ex = px - t * dx
+            ey = py - t * dy
             
-            # Distance from point to projection
-            dist = math.sqrt((lng - proj_x) ** 2 + (lat - proj_y) ** 2)
+            # Squared distance from point to projection
+            dist_sq = ex * ex + ey * ey
         
-        min_dist = min(min_dist, dist)
+        if dist_sq < min_dist_sq:
+            min_dist_sq = dist_sq
+        x1, y1 = x2, y2
     
-    return min_dist
+    return math.sqrt(min_dist_sq)
+
+
+def _simplify_ring(ring: list, tolerance: float) -> list:
+    """
+    Simplify a polyline/ring with the Ramer-Douglas-Peucker algorithm.
+    
+    Args:
+        ring: List of [lng, lat] coordinate pairs (a closed ring keeps its
+            closing point, since the first and last vertices are always kept)
+        tolerance: Maximum distance in degrees a dropped vertex may lie from
+            the simplified line
+        
+    Returns:
+        New list containing the kept vertices, in their original order
+    """
+    n = len(ring)
+    if n < 3:
+        return list(ring)
+    
+    tolerance_sq = tolerance * tolerance
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    
+    # Iterative (explicit stack) so large rings can't hit the recursion limit
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        x1, y1 = ring[start]
+        x2, y2 = ring[end]
+        dx = x2 - x1
+        dy = y2 - y1
+        length_sq = dx * dx + dy * dy
+        
+        max_dist_sq = -1.0
+        max_idx = start
+        for i in range(start + 1, end):
+            px = ring[i][0] - x1
+            py = ring[i][1] - y1
+            if length_sq == 0:
+                # Segment is a point (e.g. a closed ring's first/last vertex)
+                dist_sq = px * px + py * py
+            else:
+                t = (px * dx + py * dy) / length_sq
+                if t < 0:
+                    t = 0
+                elif t > 1:
+                    t = 1
+                ex = px - t * dx
+                ey = py - t * dy
+                dist_sq = ex * ex + ey * ey
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                max_idx = i
+        
+        if max_dist_sq > tolerance_sq:
+            keep[max_idx] = True
+            stack.append((start, max_idx))
+            stack.append((max_idx, end))
+    
+    return [coord for coord, kept in zip(ring, keep) if kept]
 
 
 LATITUDE_KEYS = {"lat", "latitude", "y", "y_coord", "geo_lat", "center_lat"}
@@ -100,7 +246,6 @@ LONGITUDE_KEYS = {"lng", "lon", "long", "longitude", "x", "x_coord", "geo_lng",
 
 def _coerce_float(value: Any) -> Optional[float]:
     try:
-        warnings = []
         if value is None or value == "":
             return None
         return float(value)
@@ -120,18 +265,89 @@ def _extract_lat_lng_from_object(obj: Dict[str, Any]) -> Tuple[Optional[float],
     return lat, lng
 
 
-def _convert_shell_to_coordinates(shell_data: Any, context: str, max_warning_logs: int = 5) -> Tuple[list, int, Optional[str]]:
+def _convert_array_shell_fast(shell_data: Any) -> Optional[Tuple[list, int, Optional[str], Optional[Dict[str, float]]]]:
+    """
+    Fast path for the common case: a shell made entirely of numeric [lng, lat]
+    pairs that are all in range. Parses and range-checks in one comprehension.
+    Returns None (so the caller falls back to the per-coordinate path with its
+    detailed logging) if any entry is malformed or out of range.
+    """
+    if not all(isinstance(c, (list, tuple)) for c in shell_data):
+        return None
+    try:
+        valid_coords = [
+            [lng_val, lat_val]
+            for lng_val, lat_val in ((float(c[0]), float(c[1])) for c in shell_data)
+            if -180 <= lng_val <= 180 and -90 <= lat_val <= 90
+        ]
+    except (TypeError, ValueError, IndexError):
+        return None
+    if len(valid_coords) != len(shell_data):
+        return None
+    return valid_coords, 0, "array", _compute_bounds(valid_coords)
+
+
+def _convert_object_shell_fast(shell_data: Any) -> Optional[Tuple[list, int, Optional[str], Optional[Dict[str, float]]]]:
+    """
+    Fast path for shells made entirely of {"lat": ..., "lng": ...} objects
+    with numeric, in-range values (TravelTime's own shell format). Anything
+    else - other key spellings, extra keys, bad values - returns None so the
+    caller falls back to the per-coordinate path.
+    """
+    if not all(isinstance(c, dict) and len(c) == 2 for c in shell_data):
+        return None
+    try:
+        valid_coords = [
+            [lng_val, lat_val]
+            for lng_val, lat_val in ((float(c["lng"]), float(c["lat"])) for c in shell_data)
+            if -180 <= lng_val <= 180 and -90 <= lat_val <= 90
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if len(valid_coords) != len(shell_data):
+        return None
+    return valid_coords, 0, "object", _compute_bounds(valid_coords)
+
+
+def _compute_bounds(coords: list) -> Dict[str, float]:
+    lng_values = [c[0] for c in coords]
+    lat_values = [c[1] for c in coords]
+    return {
+        "lng_min": min(lng_values),
+        "lng_max": max(lng_values),
+        "lat_min": min(lat_values),
+        "lat_max": max(lat_values),
+    }
+
+
+def _convert_shell_to_coordinates(
+    shell_data: Any, context: str, max_warning_logs: int = 5
+) -> Tuple[list, int, Optional[str], Optional[Dict[str, float]]]:
     """
     Normalize raw TravelTime shell coordinates into GeoJSON-friendly [lng, lat] pairs.
-    Returns (valid_coords, invalid_count, coord_format)
+    The bounding box is accumulated in the same pass so callers don't rescan the ring.
+    Returns (valid_coords, invalid_count, coord_format, bounds); bounds is None
+    when there are no valid coordinates.
     """
     valid_coords = []
     invalid_count = 0
     coord_format = None
+    lng_min = lat_min = math.inf
+    lng_max = lat_max = -math.inf
 
     if not isinstance(shell_data, (list, tuple)):
-        logger.warning(f"[Isochrone] Shell data '{context}' is not a list/tuple (type={type(shell_data).__name__})")
-        return valid_coords, invalid_count, coord_format
+        logger.warning("[Isochrone] Shell data '%s' is not a list/tuple (type=%s)", context, type(shell_data).__name__)
+        return valid_coords, invalid_count, coord_format, None
+
+    # Shells use one coordinate layout throughout, so sniff the first entry and
+    # try the matching fast path before the generic per-coordinate loop
+    if shell_data:
+        if isinstance(shell_data[0], dict):
+            fast = _convert_object_shell_fast(shell_data)
+        else:
+            fast = _convert_array_shell_fast(shell_data)
+        if fast is not None:
+            return fast
 
     for idx, coord in enumerate(shell_data):
         lng_val = None
@@ -155,35 +371,41 @@ def _convert_shell_to_coordinates(shell_data: Any, context: str, max_warning_log
         else:
             invalid_count += 1
             if invalid_count <= max_warning_logs:
-                logger.warning(f"[Isochrone] Invalid coordinate ({context}) at index {idx}: {coord}")
+                logger.warning("[Isochrone] Invalid coordinate (%s) at index %s: %s", context, idx, coord)
             continue
 
         if lng_val is None or lat_val is None:
             invalid_count += 1
             if invalid_count <= max_warning_logs:
-                logger.warning(f"[Isochrone] Missing lat/lng ({context}) at index {idx}: {coord}")
+                logger.warning("[Isochrone] Missing lat/lng (%s) at index %s: %s", context, idx, coord)
             continue
 
         if not (-180 <= lng_val <= 180) or not (-90 <= lat_val <= 90):
             invalid_count += 1
             if invalid_count <= max_warning_logs:
-                logger.warning(f"[Isochrone] Coordinate out of range ({context}) idx {idx}: lng={lng_val}, lat={lat_val}")
+                logger.warning("[Isochrone] Coordinate out of range (%s) idx %s: lng=%s, lat=%s", context, idx, lng_val, lat_val)
             continue
 
         valid_coords.append([lng_val, lat_val])
+        if lng_val < lng_min:
+            lng_min = lng_val
+        if lng_val > lng_max:
+            lng_max = lng_val
+        if lat_val < lat_min:
+            lat_min = lat_val
+        if lat_val > lat_max:
+            lat_max = lat_val
 
-    return valid_coords, invalid_count, coord_format
+    if not valid_coords:
+        return valid_coords, invalid_count, coord_format, None
 
-
-def _compute_bounds(coords: list) -> Dict[str, float]:
-    lng_values = [c[0] for c in coords]
-    lat_values = [c[1] for c in coords]
-    return {
-        "lng_min": min(lng_values),
-        "lng_max": max(lng_values),
-        "lat_min": min(lat_values),
-        "lat_max": max(lat_values),
+    bounds = {
+        "lng_min": lng_min,
+        "lng_max": lng_max,
+        "lat_min": lat_min,
+        "lat_max": lat_max,
     }
+    return valid_coords, invalid_count, coord_format, bounds
 
 
 def _bounds_contain_point(bounds: Dict[str, float], lng: float, lat: float) -> bool:
@@ -193,14 +415,6 @@ def _bounds_contain_point(bounds: Dict[str, float], lng: float, lat: float) -> b
     )
 
 
-def _ensure_closed_ring(coords: list) -> list:
-    if not coords:
-        return coords
-    if coords[0] != coords[-1]:
-        return coords + [coords[0]]
-    return coords
-
-
 def get_isochrone(lat: float, lng: float, minutes: int, mock: bool = False) -> Dict[str, Any]:
     """
     Get isochrone polygon from TravelTime API.
@@ -226,68 +440,258 @@ def get_isochrone(lat: float, lng: float, minutes: int, mock: bool = False) -> D
             }
         }
     """
+    return get_isochrones(lat, lng, [minutes], mock=mock)[minutes]
+
+
+def get_isochrone_bytes(lat: float, lng: float, minutes: int, mock: bool = False) -> bytes:
+    """
+    Same as get_isochrone, but returns the Feature already serialized to JSON.
+    
+    Lets web handlers send the polygon as-is instead of re-encoding thousands
+    of coordinates through the framework's JSON encoder.
+    
+    Returns:
+        UTF-8 encoded GeoJSON Feature
+    """
+    # Serialized straight from the (shared) cached feature: nothing here
+    # mutates it, so the defensive copy get_isochrone makes isn't needed
+    return orjson.dumps(_get_isochrones(lat, lng, [minutes], mock, copy_shared=False)[minutes])
+
+
+def _isochrone_cache_key(lat: float, lng: float, minutes: int) -> Tuple[float, float, int]:
+    return round(float(lat), 5), round(float(lng), 5), int(minutes)
+
+
+def _isochrone_cache_get(key: Tuple[float, float, int]) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Look up a cached feature.
+    
+    Returns:
+        (the cached feature - shared, so callers must not mutate it - or None
+        if missing/too old, whether it is stale)
+    """
+    with _isochrone_cache_lock:
+        entry = _isochrone_cache.get(key)
+        if entry is None:
+            return None, False
+        fetched_at, feature = entry
+        age = time.time() - fetched_at
+        if age >= ISOCHRONE_CACHE_MAX_AGE:
+            del _isochrone_cache[key]
+            return None, False
+        _isochrone_cache.move_to_end(key)
+    return feature, age >= ISOCHRONE_CACHE_TTL
+
+
+def _isochrone_cache_put(key: Tuple[float, float, int], feature: Dict[str, Any]) -> None:
+    with _isochrone_cache_lock:
+        _isochrone_cache[key] = (time.time(), feature)
+        _isochrone_cache.move_to_end(key)
+        while len(_isochrone_cache) > ISOCHRONE_CACHE_SIZE:
+            _isochrone_cache.popitem(last=False)
+
+
+def _search_id(lat: float, lng: float, minutes: int) -> str:
+    return f"isochrone_{minutes}min_{lat:.5f}_{lng:.5f}"
+
+
+def get_isochrones(lat: float, lng: float, minutes_list: List[int], mock: bool = False) -> Dict[int, Dict[str, Any]]:
+    """
+    Get isochrone polygons for several travel times around one point using a
+    single TravelTime request (one arrival search per travel time).
+    
+    Args:
+        lat: Latitude of center point
+        lng: Longitude of center point
+        minutes_list: Travel times in minutes (e.g. [30, 45, 60])
+        mock: If True, return mock polygons instead of calling API
+        
+    Returns:
+        Dictionary mapping each travel time to its GeoJSON Feature
+        (same format as get_isochrone). Live results are cached, and only
+        travel times missing from the cache are requested.
+    """
+    return _get_isochrones(lat, lng, minutes_list, mock, copy_shared=True)
+
+
+def _get_isochrones(
+    lat: float,
+    lng: float,
+    minutes_list: List[int],
+    mock: bool,
+    copy_shared: bool,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Implementation of get_isochrones. With copy_shared=False, cached and
+    freshly fetched features are returned as the shared cached objects, for
+    callers that only serialize them.
+    """
+    # Deduplicate while keeping the caller's order
+    minutes_tiers = list(dict.fromkeys(int(m) for m in minutes_list))
+    
     if mock:
-        return _get_mock_polygon(lat, lng, minutes)
+        return {minutes: _get_mock_polygon(lat, lng, minutes) for minutes in minutes_tiers}
     
     if not TRAVELTIME_API_KEY or not TRAVELTIME_APP_ID:
         logger.error("TravelTime API credentials not configured!")
-        logger.error(f"  TRAVELTIME_API_KEY present: {bool(TRAVELTIME_API_KEY)}")
-        logger.error(f"  TRAVELTIME_APP_ID present: {bool(TRAVELTIME_APP_ID)}")
+        logger.error("  TRAVELTIME_API_KEY present: %s", bool(TRAVELTIME_API_KEY))
+        logger.error("  TRAVELTIME_APP_ID present: %s", bool(TRAVELTIME_APP_ID))
         logger.warning("  → Falling back to mock polygon")
-        return _get_mock_polygon(lat, lng, minutes)
+        return {minutes: _get_mock_polygon(lat, lng, minutes) for minutes in minutes_tiers}
     
-    # Initialize warnings list for collecting API response warnings
-    warnings = []
+    features = {}
+    missing_tiers = []
+    stale_tiers = []
+    for minutes in minutes_tiers:
+        cached, stale = _isochrone_cache_get(_isochrone_cache_key(lat, lng, minutes))
+        if cached is None:
+            missing_tiers.append(minutes)
+            continue
+        # Hand back a copy so callers can't mutate the cached feature
+        features[minutes] = copy.deepcopy(cached) if copy_shared else cached
+        if stale:
+            stale_tiers.append(minutes)
+    if stale_tiers:
+        _schedule_refresh(lat, lng, stale_tiers)
+    if not missing_tiers:
+        logger.info("Isochrone cache hit for %s minutes at (%s, %s)", minutes_tiers, lat, lng)
+        return features
+    
+    for minutes, feature in _fetch_isochrones_shared(lat, lng, missing_tiers).items():
+        # The shared feature is also the cached one, so hand back a copy
+        features[minutes] = copy.deepcopy(feature) if copy_shared else feature
+    return {minutes: features[minutes] for minutes in minutes_tiers}
+
+
+def _schedule_refresh(lat: float, lng: float, minutes_tiers: List[int]) -> None:
+    """Refresh stale cache entries in the background, skipping ones already in flight"""
+    global _refresh_executor
+    with _inflight_lock:
+        tiers = []
+        for minutes in minutes_tiers:
+            key = _isochrone_cache_key(lat, lng, minutes)
+            if key not in _inflight and key not in _refreshing:
+                _refreshing.add(key)
+                tiers.append(minutes)
+    if not tiers:
+        return
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="isochrone-refresh")
+    logger.info("Refreshing stale isochrones for %s minutes at (%s, %s) in the background", tiers, lat, lng)
+    _refresh_executor.submit(_refresh_isochrones, lat, lng, tiers)
+
+
+def _refresh_isochrones(lat: float, lng: float, minutes_tiers: List[int]) -> None:
+    try:
+        _fetch_isochrones_shared(lat, lng, minutes_tiers)
+    except Exception as e:
+        # The stale entries stay in place, so callers keep getting them
+        logger.warning("Background isochrone refresh failed for %s minutes at (%s, %s): %s", minutes_tiers, lat, lng, e)
+    finally:
+        with _inflight_lock:
+            for minutes in minutes_tiers:
+                _refreshing.discard(_isochrone_cache_key(lat, lng, minutes))
+
+
+def _fetch_isochrones_shared(lat: float, lng: float, missing_tiers: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch (and cache) the given travel times, sharing requests with other threads.
+    
+    Returns:
+        Dictionary mapping each travel time to its (cached, shared) GeoJSON Feature
+    """
+    # Single-flight: a travel time another thread is already fetching for this
+    # center is waited on rather than requested a second time
+    owned: Dict[int, Future] = {}
+    waiting: Dict[int, Future] = {}
+    with _inflight_lock:
+        for minutes in missing_tiers:
+            key = _isochrone_cache_key(lat, lng, minutes)
+            future = _inflight.get(key)
+            if future is None:
+                future = _inflight[key] = Future()
+                owned[minutes] = future
+            else:
+                waiting[minutes] = future
     
+    if owned:
+        try:
+            fetched = _fetch_isochrones(lat, lng, list(owned))
+        except BaseException as exc:
+            for future in owned.values():
+                future.set_exception(exc)
+            raise
+        else:
+            for minutes, future in owned.items():
+                future.set_result(fetched[minutes])
+        finally:
+            with _inflight_lock:
+                for minutes in owned:
+                    _inflight.pop(_isochrone_cache_key(lat, lng, minutes), None)
+    
+    if waiting:
+        logger.info("Waiting on in-flight TravelTime request for %s minutes at (%s, %s)", list(waiting), lat, lng)
+    return {minutes: future.result() for minutes, future in {**owned, **waiting}.items()}
+
+
+def _fetch_isochrones(lat: float, lng: float, minutes_tiers: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Request isochrones for the given travel times from TravelTime in one call
+    and cache each resulting feature.
+    
+    Returns:
+        Dictionary mapping each travel time to its (cached, shared) GeoJSON Feature
+        
+    Raises:
+        ValueError: If the request fails or the response can't be parsed
+    """
     try:
         # TravelTime API endpoint - time-map is a POST endpoint
         url = "https://api.traveltimeapp.com/v4/time-map"
         
-        headers = {
-            "Content-Type": "application/json",
-            "X-Application-Id": TRAVELTIME_APP_ID,
-            "X-Api-Key": TRAVELTIME_API_KEY
-        }
-        
         # TravelTime API request body for POST endpoint
         # Based on working Cloudflare Worker implementation
         # Uses arrival_searches without locations array for simpler, more reliable requests
         arrival_time_iso = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        # Every search shares the same center, so build its coords once;
+        # orjson serializes shared references like separate copies
+        coords = {
+            "lat": float(lat),
+            "lng": float(lng)
+        }
         body = {
             "arrival_searches": [
                 {
-                    "id": f"isochrone_{minutes}min_{lat:.5f}_{lng:.5f}",
-                    "coords": {
-                        "lat": float(lat),
-                        "lng": float(lng)
-                    },
+                    "id": _search_id(lat, lng, minutes),
+                    "coords": coords,
                     "arrival_time": arrival_time_iso,
                     "travel_time": int(minutes * 60),  # Convert minutes to seconds
-                    "transportation": {
-                        "type": "driving"
-                    }
+                    "transportation": _TRANSPORTATION,
                 }
+                for minutes in minutes_tiers
             ]
         }
         
-        logger.info(f"Calling TravelTime API (POST) for {minutes} minutes at ({lat}, {lng})")
-        logger.info(f"API request: coords={{lat: {lat}, lng: {lng}}}, transportation=driving, travel_time={int(minutes * 60)}s")
-        logger.debug(f"Full API request body: {body}")
-        response = requests.post(url, json=body, headers=headers, timeout=30)
+        logger.info("Calling TravelTime API (POST) for %s minutes at (%s, %s)", minutes_tiers, lat, lng)
+        logger.info("API request: coords={lat: %s, lng: %s}, transportation=driving, travel_times=%ss", lat, lng, [int(m * 60) for m in minutes_tiers])
+        logger.debug("Full API request body: %s", body)
+        response = _SESSION.post(url, data=orjson.dumps(body), timeout=TRAVELTIME_TIMEOUT)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Log raw API response structure for debugging
-        logger.info(f"TravelTime API response keys: {list(data.keys())}")
-        logger.info(f"TravelTime API response status: {response.status_code}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TravelTime API response keys: %s", list(data.keys()))
+        logger.debug("TravelTime API response status: %s", response.status_code)
         
         # Log full response structure at DEBUG level (coordinates may be large)
         # This helps diagnose parsing issues
-        logger.debug(f"TravelTime API full response structure: {data}")
+        logger.debug("TravelTime API full response structure: %s", data)
         
         # Log a summary of the response structure without full coordinates
-        if "results" in data:
+        if "results" in data and logger.isEnabledFor(logging.DEBUG):
             results_summary = []
             for i, result in enumerate(data.get("results", [])[:3]):  # Limit to first 3 results
                 result_summary = {"index": i, "keys": list(result.keys())}
@@ -304,320 +708,446 @@ def get_isochrone(lat: float, lng: float, minutes: int, mock: bool = False) -> D
                         shapes_info.append(shape_info)
                     result_summary["shapes"] = shapes_info
                 results_summary.append(result_summary)
-            logger.info(f"TravelTime API response structure summary: {results_summary}")
+            logger.debug("TravelTime API response structure summary: %s", results_summary)
         
         # Extract polygon from TravelTime response
         # TravelTime returns results in a specific format
         results = data.get("results", [])
-        logger.info(f"Number of results in response: {len(results)}")
+        logger.debug("Number of results in response: %s", len(results))
         
         if not results:
             logger.error("No isochrone results from TravelTime API")
-            logger.error(f"Full response structure: {data}")
+            logger.error("Full response structure: %s", data)
             raise ValueError(
                 "TravelTime API returned no results. "
                 "Check API credentials and request parameters."
             )
         
-        # Get the first result
-        result = results[0]
-        logger.info(f"First result keys: {list(result.keys())}")
-        
-        # TravelTime API v4 can return shapes in different formats
-        # Try to extract shapes from the result
-        shapes = result.get("shapes", [])
-        logger.info(f"Number of shapes in result: {len(shapes)}")
-        
-        # Alternative: check if result itself contains shell/holes directly
-        if not shapes and ("shell" in result or "holes" in result or "shells" in result):
-            logger.info("Found shell/holes directly in result, not in shapes array")
-            shapes = [result]
-        
-        if not shapes:
-            logger.error("No shapes found in TravelTime response")
-            logger.error(f"Full response structure: {data}")
-            logger.error(f"Result structure: {result}")
-            raise ValueError(
-                f"No shapes found in TravelTime API response. "
-                f"Result keys: {list(result.keys())}. "
-                f"Expected 'shapes' array or 'shell'/'shells' in result."
-            )
-        
-        center_lng = float(lng)
-        center_lat = float(lat)
-
-        # Check ALL shapes, not just the first one!
-        # TravelTime API can return multiple shapes (e.g., disconnected regions)
-        # We need to find the shape that contains the center point
-        logger.info(f"Checking all {len(shapes)} shapes to find the one containing center point...")
-        
-        candidate_shells = []
-
-        for shape_idx, shape in enumerate(shapes):
-            logger.debug(f"Checking shape {shape_idx}: {list(shape.keys())}")
-
-            if "shell" in shape:
-                candidate_shells.append((f"shape[{shape_idx}].shell", shape.get("shell", [])))
-                logger.debug(f"Found 'shell' in shape {shape_idx}")
-
-            if "shells" in shape:
-                shells = shape.get("shells", [])
-                logger.debug(f"Found 'shells' (plural) in shape {shape_idx} with {len(shells)} shell(s)")
-                for idx, shell_entry in enumerate(shells):
-                    candidate_shells.append((f"shape[{shape_idx}].shells[{idx}]", shell_entry))
-
-            if not candidate_shells and "coordinates" in shape:
-                logger.debug(f"Found 'coordinates' in shape {shape_idx}")
-                candidate_shells.append((f"shape[{shape_idx}].coordinates", shape.get("coordinates", [])))
-
-            if not candidate_shells and "geometry" in shape:
-                geom = shape.get("geometry", {})
-                if geom.get("type") == "Polygon" and geom.get("coordinates"):
-                    candidate_shells.append((f"shape[{shape_idx}].geometry.coordinates[0]", geom["coordinates"][0]))
-
-        if not candidate_shells:
-            logger.error("No shell data found in any TravelTime response shape")
-            raise ValueError("Could not locate shell/shells/coordinates data in TravelTime API response.")
-
-        candidate_coords = []
-        for label, raw_shell in candidate_shells:
-            coords, invalid_count, coord_format = _convert_shell_to_coordinates(raw_shell, context=label)
-            if invalid_count > 0:
-                warnings.append(f"{invalid_count} invalid coordinates removed from TravelTime response ({label})")
-            if len(coords) < 3:
-                logger.warning(f"[Isochrone] Candidate shell '{label}' discarded (only {len(coords)} valid coords)")
-                continue
-            
-            # Check if coordinates might be swapped by testing both orientations
-            bounds = _compute_bounds(coords)
-            center_in_bounds = _bounds_contain_point(bounds, center_lng, center_lat)
-            
-            # If center is not in bounds, try swapping coordinates
-            if not center_in_bounds:
-                logger.debug(f"[Isochrone] Center not in bounds for '{label}', checking if coordinates are swapped")
-                # Try swapping: if coords are [lat, lng], swap to [lng, lat]
-                swapped_coords = [[c[1], c[0]] for c in coords]  # Swap lat/lng
-                swapped_bounds = _compute_bounds(swapped_coords)
-                swapped_center_in_bounds = _bounds_contain_point(swapped_bounds, center_lng, center_lat)
-                
-                if swapped_center_in_bounds:
-                    logger.info(f"[Isochrone] Coordinates were swapped! Using swapped coordinates for '{label}'")
-                    coords = swapped_coords
-                    bounds = swapped_bounds
-                    coord_format = f"{coord_format}_swapped" if coord_format else "swapped"
-                else:
-                    logger.debug(f"[Isochrone] Center still not in bounds after swapping for '{label}'")
-            
-            candidate_coords.append({
-                "label": label,
-                "coords": coords,
-                "bounds": bounds,
-                "coord_format": coord_format,
-            })
-
-        if not candidate_coords:
-            logger.error("All candidate shells were invalid after coordinate normalization")
-            raise ValueError("Unable to extract a valid polygon ring from TravelTime response.")
-
-        # Log all candidates for debugging
-        logger.info(f"Found {len(candidate_coords)} candidate shells:")
-        for idx, cand in enumerate(candidate_coords):
-            center_in_bounds = _bounds_contain_point(cand['bounds'], center_lng, center_lat)
-            logger.info(f"  Candidate {idx}: {cand['label']} - {len(cand['coords'])} coords")
-            logger.info(f"    Bounds: lng [{cand['bounds']['lng_min']:.6f}, {cand['bounds']['lng_max']:.6f}], lat [{cand['bounds']['lat_min']:.6f}, {cand['bounds']['lat_max']:.6f}]")
-            logger.info(f"    Center ({center_lng:.6f}, {center_lat:.6f}) in bounds: {center_in_bounds}")
-
-        selected_candidate = None
-        selection_reason = ""
-
-        for candidate in candidate_coords:
-            ring = _ensure_closed_ring(candidate["coords"])
-            if _point_in_polygon(center_lng, center_lat, ring):
-                selected_candidate = candidate
-                selection_reason = f"{candidate['label']} (center covered)"
-                break
-
-        if not selected_candidate:
-            for candidate in candidate_coords:
-                if _bounds_contain_point(candidate["bounds"], center_lng, center_lat):
-                    selected_candidate = candidate
-                    selection_reason = f"{candidate['label']} (bbox overlap)"
-                    break
-
-        if not selected_candidate:
-            selected_candidate = max(candidate_coords, key=lambda c: len(c["coords"]))
-            selection_reason = f"{selected_candidate['label']} (fallback longest ring)"
-
-        logger.info(f"Selected shell: {selected_candidate['label']} - reason: {selection_reason}")
-        logger.debug(f"Selected shell bounds: {selected_candidate['bounds']}")
-
-        valid_coords = list(selected_candidate["coords"])
-        coord_format = selected_candidate["coord_format"]
-        
-        # Convert to GeoJSON format
-        # Ensure polygon is closed (first point equals last point)
-        coordinates = valid_coords
-        if coordinates[0] != coordinates[-1]:
-            coordinates.append(coordinates[0])
-            logger.debug("Polygon was not closed, added closing point")
-        
-        logger.info(f"Final coordinate count: {len(coordinates)}")
-        
-        # Calculate bounding box of isochrone
-        lng_min = min(c[0] for c in coordinates)
-        lng_max = max(c[0] for c in coordinates)
-        lat_min = min(c[1] for c in coordinates)
-        lat_max = max(c[1] for c in coordinates)
-        
-        logger.debug(f"Coordinate bounds - Lng: [{lng_min:.6f}, {lng_max:.6f}], Lat: [{lat_min:.6f}, {lat_max:.6f}]")
-        
-        # Log center point and bounds for debugging
-        logger.info(f"Center point: ({center_lat:.6f}, {center_lng:.6f})")
-        logger.info(f"Isochrone bounds: Lng[{lng_min:.6f}, {lng_max:.6f}], Lat[{lat_min:.6f}, {lat_max:.6f}]")
-        
-        # Calculate distance from center to bounding box center
-        bbox_center_lng = (lng_min + lng_max) / 2
-        bbox_center_lat = (lat_min + lat_max) / 2
-        bbox_offset_lng = abs(center_lng - bbox_center_lng)
-        bbox_offset_lat = abs(center_lat - bbox_center_lat)
-        logger.debug(f"BBox center: ({bbox_center_lat:.6f}, {bbox_center_lng:.6f})")
-        logger.debug(f"Center offset from bbox center: Lng={bbox_offset_lng:.6f}, Lat={bbox_offset_lat:.6f}")
-        
-        # First check if center is within bounding box (quick check)
-        center_in_bbox = (lng_min <= center_lng <= lng_max) and (lat_min <= center_lat <= lat_max)
-        
-        if not center_in_bbox:
-            # Calculate how far outside the bbox the center is
-            lng_offset = 0
-            lat_offset = 0
-            if center_lng < lng_min:
-                lng_offset = lng_min - center_lng
-            elif center_lng > lng_max:
-                lng_offset = center_lng - lng_max
-            if center_lat < lat_min:
-                lat_offset = lat_min - center_lat
-            elif center_lat > lat_max:
-                lat_offset = center_lat - lat_max
-            
-            logger.warning(
-                f"WARNING: Center point ({center_lat:.6f}, {center_lng:.6f}) is NOT within isochrone bounding box. "
-                f"BBox: Lng[{lng_min:.6f}, {lng_max:.6f}], Lat[{lat_min:.6f}, {lat_max:.6f}]. "
-                f"Offset: Lng={lng_offset:.6f}°, Lat={lat_offset:.6f}° "
-                f"(≈{lng_offset*111:.1f}km E/W, {lat_offset*111:.1f}km N/S). "
-                f"This indicates a significant offset issue - the isochrone may be in the wrong location."
-            )
-            warnings.append(
-                "Isochrone polygon does not enclose the requested center point. "
-                "TravelTime API may have returned an offset polygon."
-            )
-        
-        # More precise check: is center within the polygon itself
-        center_in_polygon = _point_in_polygon(center_lng, center_lat, coordinates)
-        
-        if not center_in_polygon:
-            # Calculate distance from center to nearest polygon edge
-            min_distance = _min_distance_to_polygon(center_lng, center_lat, coordinates)
-            logger.warning(
-                f"WARNING: Center point ({center_lat}, {center_lng}) is NOT within the isochrone polygon. "
-                f"Minimum distance to polygon edge: {min_distance:.6f} degrees. "
-                f"This suggests the isochrone may not be properly centered on the departure point."
-            )
-            warnings.append(
-                f"Isochrone polygon does not contain the marker. Offset ≈ {min_distance*111:.1f} km. "
-                "Consider verifying the coordinates or retrying the request."
-            )
-            # If the center is very close (within 0.01 degrees ≈ 1.1 km), it's likely a minor offset
-            # If it's far away, there's a more serious issue
-            if min_distance > 0.01:
-                logger.error(
-                    f"ERROR: Center point is {min_distance:.6f} degrees away from isochrone. "
-                    f"This is a significant offset and may indicate an API issue."
-                )
-        else:
-            logger.info(f"Center point ({center_lat}, {center_lng}) is within the isochrone polygon ✓")
-        
-        # GeoJSON Polygon format: coordinates is an array of linear rings
-        # Each ring is an array of [lng, lat] coordinate pairs
-        geojson = {
-            "type": "Feature",
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [coordinates]  # Single ring polygon
-            },
-            "properties": {
-                "minutes": minutes,
-                "center": [center_lng, center_lat],
-                "mock": False,
-                "warnings": warnings,
-                "selection_reason": selection_reason,
-                "shell_label": selected_candidate["label"]
-            }
-        }
-        
-        logger.info(f"Generated isochrone for {minutes} minutes at ({lat}, {lng}) with {len(coordinates)} points")
-        logger.debug(f"GeoJSON structure: type={geojson['type']}, geometry.type={geojson['geometry']['type']}, coordinates.rings={len(geojson['geometry']['coordinates'])}")
-        return geojson
+        results_by_id = {r.get("search_id"): r for r in results if isinstance(r, dict)}
+        features = {}
+        for idx, minutes in enumerate(minutes_tiers):
+            # Match results to searches by id; fall back to request order
+            result = results_by_id.get(_search_id(lat, lng, minutes))
+            if result is None and idx < len(results):
+                result = results[idx]
+            if result is None:
+                raise ValueError(f"TravelTime API returned no result for the {minutes} minute search.")
+            features[minutes] = _build_feature_from_result(result, lat, lng, minutes)
+            _isochrone_cache_put(_isochrone_cache_key(lat, lng, minutes), features[minutes])
+        return features
         
     except requests.exceptions.RequestException as e:
         # Network/HTTP errors - these are actual API failures, not parsing issues
-        logger.error(f"Error fetching isochrone from TravelTime API: {e}")
-        logger.error(f"Request URL: {url}")
-        logger.error(f"Request headers: {headers}")
+        logger.error("Error fetching isochrone from TravelTime API: %s", e)
+        logger.error("Request URL: %s", url)
         raise ValueError(f"TravelTime API request failed: {str(e)}") from e
     except (KeyError, ValueError) as e:
         # Parsing/validation errors - log full response structure for debugging
         logger.error("=" * 80)
-        logger.error(f"ERROR parsing TravelTime API response: {e}")
+        logger.error("ERROR parsing TravelTime API response: %s", e)
         logger.error("=" * 80)
         if 'data' in locals():
-            logger.error(f"Full API response structure:")
-            logger.error(f"  Type: {type(data)}")
+            logger.error("Full API response structure:")
+            logger.error("  Type: %s", type(data))
             if isinstance(data, dict):
-                logger.error(f"  Top-level keys: {list(data.keys())}")
+                logger.error("  Top-level keys: %s", list(data.keys()))
                 if "results" in data:
                     results = data.get("results", [])
-                    logger.error(f"  Number of results: {len(results)}")
+                    logger.error("  Number of results: %s", len(results))
                     if results:
                         first_result = results[0]
-                        logger.error(f"  First result keys: {list(first_result.keys()) if isinstance(first_result, dict) else 'NOT A DICT'}")
+                        logger.error("  First result keys: %s", list(first_result.keys()) if isinstance(first_result, dict) else 'NOT A DICT')
                         if isinstance(first_result, dict) and "shapes" in first_result:
                             shapes = first_result.get("shapes", [])
-                            logger.error(f"  Number of shapes: {len(shapes)}")
+                            logger.error("  Number of shapes: %s", len(shapes))
                             if shapes:
                                 first_shape = shapes[0]
-                                logger.error(f"  First shape keys: {list(first_shape.keys()) if isinstance(first_shape, dict) else 'NOT A DICT'}")
+                                logger.error("  First shape keys: %s", list(first_shape.keys()) if isinstance(first_shape, dict) else 'NOT A DICT')
             else:
-                logger.error(f"  Response is not a dict: {str(data)[:500]}")
+                logger.error("  Response is not a dict: %s", str(data)[:500])
         if 'result' in locals():
-            logger.error(f"Result structure: {result}")
+            logger.error("Result structure: %s", result)
         if 'first_shape' in locals():
-            logger.error(f"First shape structure: {first_shape}")
+            logger.error("First shape structure: %s", first_shape)
         logger.error("=" * 80)
         raise ValueError(f"Failed to parse TravelTime API response: {str(e)}") from e
     except Exception as e:
         # Unexpected errors - log everything for debugging
         logger.error("=" * 80)
-        logger.error(f"UNEXPECTED ERROR in isochrone client: {e}")
+        logger.error("UNEXPECTED ERROR in isochrone client: %s", e)
         logger.error("=" * 80)
-        logger.error(f"Exception type: {type(e).__name__}")
-        logger.error(f"Exception message: {str(e)}")
+        logger.error("Exception type: %s", type(e).__name__)
+        logger.error("Exception message: %s", str(e))
         import traceback
-        logger.error(f"Full traceback:\n{traceback.format_exc()}")
+        logger.error("Full traceback:\n%s", traceback.format_exc())
         if 'data' in locals():
-            logger.error(f"Full API response structure:")
-            logger.error(f"  Type: {type(data)}")
+            logger.error("Full API response structure:")
+            logger.error("  Type: %s", type(data))
             if isinstance(data, dict):
-                logger.error(f"  Top-level keys: {list(data.keys())}")
+                logger.error("  Top-level keys: %s", list(data.keys()))
             else:
-                logger.error(f"  Response is not a dict: {str(data)[:500]}")
+                logger.error("  Response is not a dict: %s", str(data)[:500])
         if 'result' in locals():
-            logger.error(f"Result structure: {result}")
+            logger.error("Result structure: %s", result)
         if 'first_shape' in locals():
-            logger.error(f"First shape structure: {first_shape}")
+            logger.error("First shape structure: %s", first_shape)
         logger.error("=" * 80)
         raise ValueError(f"Unexpected error processing TravelTime API response: {str(e)}") from e
 
 
+async def get_isochrones_batch(
+    queries: Iterable[Tuple[float, float, int]],
+    mock: bool = False,
+    concurrency: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch isochrones for many (lat, lng, minutes) queries concurrently.
+    
+    Queries sharing a center are grouped into one get_isochrones call (one
+    TravelTime request for all their travel times), and the groups run in
+    worker threads with bounded parallelism, so a batch takes roughly as long
+    as its slowest request instead of the sum of all of them.
+    
+    Args:
+        queries: (lat, lng, minutes) tuples
+        mock: If True, return mock polygons instead of calling API
+        concurrency: Maximum number of TravelTime requests in flight at once
+        
+    Returns:
+        GeoJSON Features in the same order as queries
+    """
+    queries = [(lat, lng, int(minutes)) for lat, lng, minutes in queries]
+    
+    # Group travel times by center, keeping first-seen order
+    centers: Dict[Tuple[float, float], List[int]] = {}
+    for lat, lng, minutes in queries:
+        centers.setdefault((lat, lng), []).append(minutes)
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _fetch(center: Tuple[float, float], minutes_list: List[int]) -> Dict[int, Dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.to_thread(get_isochrones, center[0], center[1], minutes_list, mock)
+    
+    results = await asyncio.gather(*(_fetch(center, tiers) for center, tiers in centers.items()))
+    by_center = dict(zip(centers, results))
+    
+    # Each query gets its own copy, even if the same one was asked for twice
+    seen = set()
+    features = []
+    for lat, lng, minutes in queries:
+        feature = by_center[(lat, lng)][minutes]
+        key = (lat, lng, minutes)
+        features.append(copy.deepcopy(feature) if key in seen else feature)
+        seen.add(key)
+    return features
+
+
+def _build_feature_from_result(
+    result: Dict[str, Any],
+    lat: float,
+    lng: float,
+    minutes: int,
+    simplify_tolerance: float = ISOCHRONE_SIMPLIFY_TOLERANCE,
+) -> Dict[str, Any]:
+    """
+    Turn one TravelTime time-map result into a GeoJSON Feature.
+    
+    Args:
+        result: A single entry of the response "results" array
+        lat: Latitude of center point
+        lng: Longitude of center point
+        minutes: Travel time in minutes for this result
+        simplify_tolerance: Ramer-Douglas-Peucker tolerance in degrees for
+            rings of at least ISOCHRONE_SIMPLIFY_MIN_POINTS points (0 disables)
+        
+    Returns:
+        GeoJSON Feature with Polygon geometry (see get_isochrone)
+        
+    Raises:
+        ValueError: If no usable polygon ring can be extracted
+    """
+    # Initialize warnings list for collecting API response warnings
+    warnings = []
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Result keys: %s", list(result.keys()))
+
+    # TravelTime API v4 can return shapes in different formats
+    # Try to extract shapes from the result
+    shapes = result.get("shapes", [])
+    logger.debug("Number of shapes in result: %s", len(shapes))
+
+    # Alternative: check if result itself contains shell/holes directly
+    if not shapes and ("shell" in result or "holes" in result or "shells" in result):
+        logger.info("Found shell/holes directly in result, not in shapes array")
+        shapes = [result]
+
+    if not shapes:
+        logger.error("No shapes found in TravelTime response")
+        logger.error("Result structure: %s", result)
+        raise ValueError(
+            f"No shapes found in TravelTime API response. "
+            f"Result keys: {list(result.keys())}. "
+            f"Expected 'shapes' array or 'shell'/'shells' in result."
+        )
+
+    center_lng = float(lng)
+    center_lat = float(lat)
+
+    # Check ALL shapes, not just the first one!
+    # TravelTime API can return multiple shapes (e.g., disconnected regions)
+    # We need to find the shape that contains the center point
+    logger.debug("Checking all %s shapes to find the one containing center point...", len(shapes))
+
+    candidate_shells = []
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    for shape_idx, shape in enumerate(shapes):
+        if debug_enabled:
+            logger.debug("Checking shape %s: %s", shape_idx, list(shape.keys()))
+
+        if "shell" in shape:
+            candidate_shells.append((f"shape[{shape_idx}].shell", shape.get("shell", [])))
+            logger.debug("Found 'shell' in shape %s", shape_idx)
+
+        if "shells" in shape:
+            shells = shape.get("shells", [])
+            logger.debug("Found 'shells' (plural) in shape %s with %s shell(s)", shape_idx, len(shells))
+            for idx, shell_entry in enumerate(shells):
+                candidate_shells.append((f"shape[{shape_idx}].shells[{idx}]", shell_entry))
+
+        if not candidate_shells and "coordinates" in shape:
+            logger.debug("Found 'coordinates' in shape %s", shape_idx)
+            candidate_shells.append((f"shape[{shape_idx}].coordinates", shape.get("coordinates", [])))
+
+        if not candidate_shells and "geometry" in shape:
+            geom = shape.get("geometry", {})
+            if geom.get("type") == "Polygon" and geom.get("coordinates"):
+                candidate_shells.append((f"shape[{shape_idx}].geometry.coordinates[0]", geom["coordinates"][0]))
+
+    if not candidate_shells:
+        logger.error("No shell data found in any TravelTime response shape")
+        raise ValueError("Could not locate shell/shells/coordinates data in TravelTime API response.")
+
+    candidate_coords = []
+    for label, raw_shell in candidate_shells:
+        coords, invalid_count, coord_format, bounds = _convert_shell_to_coordinates(raw_shell, context=label)
+        if invalid_count > 0:
+            warnings.append(f"{invalid_count} invalid coordinates removed from TravelTime response ({label})")
+        if len(coords) < 3:
+            logger.warning("[Isochrone] Candidate shell '%s' discarded (only %s valid coords)", label, len(coords))
+            continue
+
+        # Check if coordinates might be swapped by testing both orientations
+        center_in_bounds = _bounds_contain_point(bounds, center_lng, center_lat)
+
+        # If center is not in bounds, try swapping coordinates
+        if not center_in_bounds:
+            logger.debug("[Isochrone] Center not in bounds for '%s', checking if coordinates are swapped", label)
+            # Try swapping: if coords are [lat, lng], swap to [lng, lat]
+            # The swapped bbox is the original one transposed, so decide from
+            # that and only build the swapped ring if it's actually used
+            swapped_bounds = {
+                "lng_min": bounds["lat_min"],
+                "lng_max": bounds["lat_max"],
+                "lat_min": bounds["lng_min"],
+                "lat_max": bounds["lng_max"],
+            }
+            swapped_center_in_bounds = _bounds_contain_point(swapped_bounds, center_lng, center_lat)
+
+            if swapped_center_in_bounds:
+                logger.info("[Isochrone] Coordinates were swapped! Using swapped coordinates for '%s'", label)
+                # Swap lat/lng in place - the pairs were freshly built by
+                # _convert_shell_to_coordinates, so nothing else references them
+                for c in coords:
+                    c.reverse()
+                bounds = swapped_bounds
+                coord_format = f"{coord_format}_swapped" if coord_format else "swapped"
+            else:
+                logger.debug("[Isochrone] Center still not in bounds after swapping for '%s'", label)
+
+        candidate_coords.append({
+            "label": label,
+            "coords": coords,
+            "bounds": bounds,
+            "coord_format": coord_format,
+        })
+
+    if not candidate_coords:
+        logger.error("All candidate shells were invalid after coordinate normalization")
+        raise ValueError("Unable to extract a valid polygon ring from TravelTime response.")
+
+    # Log all candidates for debugging
+    logger.info("Found %s candidate shells:", len(candidate_coords))
+    for idx, cand in enumerate(candidate_coords if logger.isEnabledFor(logging.INFO) else ()):
+        center_in_bounds = _bounds_contain_point(cand['bounds'], center_lng, center_lat)
+        logger.info("  Candidate %s: %s - %s coords", idx, cand['label'], len(cand['coords']))
+        logger.info("    Bounds: lng [%.6f, %.6f], lat [%.6f, %.6f]", cand['bounds']['lng_min'], cand['bounds']['lng_max'], cand['bounds']['lat_min'], cand['bounds']['lat_max'])
+        logger.info("    Center (%.6f, %.6f) in bounds: %s", center_lng, center_lat, center_in_bounds)
+
+    selected_candidate = None
+    selection_reason = ""
+    center_covered = False
+
+    for candidate in candidate_coords:
+        # Cheap bbox rejection first - a point outside the bbox can't be inside the ring
+        if not _bounds_contain_point(candidate["bounds"], center_lng, center_lat):
+            continue
+        # _point_in_polygon wraps around from the last vertex, so the ring
+        # doesn't need a closing point (it's only added once, for the GeoJSON)
+        if _point_in_polygon(center_lng, center_lat, candidate["coords"]):
+            selected_candidate = candidate
+            selection_reason = f"{candidate['label']} (center covered)"
+            center_covered = True
+            break
+
+    if not selected_candidate:
+        for candidate in candidate_coords:
+            if _bounds_contain_point(candidate["bounds"], center_lng, center_lat):
+                selected_candidate = candidate
+                selection_reason = f"{candidate['label']} (bbox overlap)"
+                break
+
+    if not selected_candidate:
+        selected_candidate = max(candidate_coords, key=lambda c: len(c["coords"]))
+        selection_reason = f"{selected_candidate['label']} (fallback longest ring)"
+
+    logger.info("Selected shell: %s - reason: %s", selected_candidate['label'], selection_reason)
+    logger.debug("Selected shell bounds: %s", selected_candidate['bounds'])
+
+    valid_coords = list(selected_candidate["coords"])
+    coord_format = selected_candidate["coord_format"]
+
+    # Convert to GeoJSON format
+    # Ensure polygon is closed (first point equals last point)
+    coordinates = valid_coords
+    first, last = coordinates[0], coordinates[-1]
+    if first[0] != last[0] or first[1] != last[1]:
+        coordinates.append(first)
+        logger.debug("Polygon was not closed, added closing point")
+
+    # Bounding box of isochrone - already computed while parsing the selected
+    # shell (the closing point repeats a vertex, so it can't change the bbox)
+    bounds = selected_candidate["bounds"]
+
+    # Drop near-collinear vertices so the payload and map rendering stay light
+    if simplify_tolerance > 0 and len(coordinates) >= ISOCHRONE_SIMPLIFY_MIN_POINTS:
+        simplified = _simplify_ring(coordinates, simplify_tolerance)
+        if len(simplified) >= 4 and len(simplified) < len(coordinates):
+            logger.debug("Simplified polygon from %s to %s points", len(coordinates), len(simplified))
+            coordinates = simplified
+            # The checks below describe the ring actually returned, so redo the
+            # bbox and containment test on it (a center within the tolerance of
+            # an edge can land on the other side once vertices are dropped)
+            bounds = _compute_bounds(coordinates)
+            center_covered = (
+                _bounds_contain_point(bounds, center_lng, center_lat)
+                and _point_in_polygon(center_lng, center_lat, coordinates)
+            )
+
+    logger.debug("Final coordinate count: %s", len(coordinates))
+    lng_min, lng_max = bounds["lng_min"], bounds["lng_max"]
+    lat_min, lat_max = bounds["lat_min"], bounds["lat_max"]
+
+    logger.debug("Coordinate bounds - Lng: [%.6f, %.6f], Lat: [%.6f, %.6f]", lng_min, lng_max, lat_min, lat_max)
+
+    # Log center point and bounds for debugging
+    logger.info("Center point: (%.6f, %.6f)", center_lat, center_lng)
+    logger.info("Isochrone bounds: Lng[%.6f, %.6f], Lat[%.6f, %.6f]", lng_min, lng_max, lat_min, lat_max)
+
+    # Calculate distance from center to bounding box center (debug output only)
+    if logger.isEnabledFor(logging.DEBUG):
+        bbox_center_lng = (lng_min + lng_max) / 2
+        bbox_center_lat = (lat_min + lat_max) / 2
+        bbox_offset_lng = abs(center_lng - bbox_center_lng)
+        bbox_offset_lat = abs(center_lat - bbox_center_lat)
+        logger.debug("BBox center: (%.6f, %.6f)", bbox_center_lat, bbox_center_lng)
+        logger.debug("Center offset from bbox center: Lng=%.6f, Lat=%.6f", bbox_offset_lng, bbox_offset_lat)
+
+    # First check if center is within bounding box (quick check)
+    center_in_bbox = (lng_min <= center_lng <= lng_max) and (lat_min <= center_lat <= lat_max)
+
+    if not center_in_bbox:
+        # Calculate how far outside the bbox the center is
+        lng_offset = 0
+        lat_offset = 0
+        if center_lng < lng_min:
+            lng_offset = lng_min - center_lng
+        elif center_lng > lng_max:
+            lng_offset = center_lng - lng_max
+        if center_lat < lat_min:
+            lat_offset = lat_min - center_lat
+        elif center_lat > lat_max:
+            lat_offset = center_lat - lat_max
+
+        logger.warning(
+            "WARNING: Center point (%.6f, %.6f) is NOT within isochrone bounding box. "
+            "BBox: Lng[%.6f, %.6f], Lat[%.6f, %.6f]. "
+            "Offset: Lng=%.6f°, Lat=%.6f° "
+            "(≈%.1fkm E/W, %.1fkm N/S). "
+            "This indicates a significant offset issue - the isochrone may be in the wrong location.",
+            center_lat, center_lng, lng_min, lng_max, lat_min, lat_max,
+            lng_offset, lat_offset, lng_offset * 111, lat_offset * 111,
+        )
+        warnings.append(
+            "Isochrone polygon does not enclose the requested center point. "
+            "TravelTime API may have returned an offset polygon."
+        )
+
+    # More precise check: is center within the polygon itself. The selection
+    # loop above already ray-cast the center against every candidate whose bbox
+    # contains it, so the selected ring contains the center exactly when it was
+    # picked as "center covered" (re-checked above if the ring was simplified)
+    center_in_polygon = center_covered
+
+    if not center_in_polygon:
+        # Calculate distance from center to nearest polygon edge
+        min_distance = _min_distance_to_polygon(center_lng, center_lat, coordinates)
+        logger.warning(
+            "WARNING: Center point (%s, %s) is NOT within the isochrone polygon. "
+            "Minimum distance to polygon edge: %.6f degrees. "
+            "This suggests the isochrone may not be properly centered on the departure point.",
+            center_lat, center_lng, min_distance,
+        )
+        warnings.append(
+            f"Isochrone polygon does not contain the marker. Offset ≈ {min_distance*111:.1f} km. "
+            "Consider verifying the coordinates or retrying the request."
+        )
+        # If the center is very close (within 0.01 degrees ≈ 1.1 km), it's likely a minor offset
+        # If it's far away, there's a more serious issue
+        if min_distance > 0.01:
+            logger.error(
+                "ERROR: Center point is %.6f degrees away from isochrone. "
+                "This is a significant offset and may indicate an API issue.",
+                min_distance,
+            )
+    else:
+        logger.info("Center point (%s, %s) is within the isochrone polygon ✓", center_lat, center_lng)
+
+    # GeoJSON Polygon format: coordinates is an array of linear rings
+    # Each ring is an array of [lng, lat] coordinate pairs
+    geojson = {
+        "type": "Feature",
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [coordinates]  # Single ring polygon
+        },
+        "properties": {
+            "minutes": minutes,
+            "center": [center_lng, center_lat],
+            "mock": False,
+            "warnings": warnings,
+            "selection_reason": selection_reason,
+            "shell_label": selected_candidate["label"]
+        }
+    }
+
+    logger.info("Generated isochrone for %s minutes at (%s, %s) with %s points", minutes, lat, lng, len(coordinates))
+    logger.debug("GeoJSON structure: type=%s, geometry.type=%s, coordinates.rings=%s", geojson['type'], geojson['geometry']['type'], len(geojson['geometry']['coordinates']))
+    return geojson
+
+
 def _get_mock_polygon(lat: float, lng: float, minutes: int) -> Dict[str, Any]:
     """
     Generate a mock isochrone polygon (approximate circle).
@@ -631,7 +1161,7 @@ def _get_mock_polygon(lat: float, lng: float, minutes: int) -> Dict[str, Any]:
     Returns:
         GeoJSON Feature with Polygon geometry
     """
-    logger.info(f"Generating mock isochrone for {minutes} minutes at ({lat}, {lng})")
+    logger.info("Generating mock isochrone for %s minutes at (%s, %s)", minutes, lat, lng)
     
     # Approximate radius calculation
     # Rough conversion: 1 degree latitude ≈ 111 km
@@ -641,58 +1171,66 @@ def _get_mock_polygon(lat: float, lng: float, minutes: int) -> Dict[str, Any]:
     radius_km = minutes * 1.0  # 1 km per minute (rough average)
     radius_degrees = radius_km / 111.0  # Convert km to degrees
     
-    logger.debug(f"Mock polygon radius: {radius_km} km ({radius_degrees:.6f} degrees)")
+    logger.debug("Mock polygon radius: %s km (%.6f degrees)", radius_km, radius_degrees)
     
-    # Generate a polygon approximating a circle with multiple points
-    num_points = 32  # More points = smoother circle
+    # Generate a polygon approximating a circle from the precomputed unit circle
     coordinates = []
+    dropped_points = 0
     
-    for i in range(num_points + 1):
-        angle = 2 * math.pi * i / num_points
-        
+    # Longitude offset varies with latitude (longitude lines converge at poles)
+    # At latitude lat, 1 degree longitude ≈ 111 km * cos(lat)
+    lng_radius_degrees = radius_degrees / math.cos(math.radians(lat))
+    
+    for i, (cos_angle, sin_angle) in enumerate(_MOCK_UNIT_CIRCLE):
         # Calculate lat/lng offsets
-        # Latitude offset is constant
-        lat_offset = radius_degrees * math.cos(angle)
-        
-        # Longitude offset varies with latitude (longitude lines converge at poles)
-        # At latitude lat, 1 degree longitude ≈ 111 km * cos(lat)
-        lng_offset = radius_degrees * math.sin(angle) / math.cos(math.radians(lat))
+        lat_offset = radius_degrees * cos_angle
+        lng_offset = lng_radius_degrees * sin_angle
         
         # Add to coordinates (GeoJSON uses [lng, lat] format)
-        lng_val = float(lng + lng_offset)
-        lat_val = float(lat + lat_offset)
+        # The offsets are floats, so these are too
+        lng_val = lng + lng_offset
+        lat_val = lat + lat_offset
         
         # Validate coordinates
         if not (-180 <= lng_val <= 180) or not (-90 <= lat_val <= 90):
-            logger.warning(f"Mock coordinate out of range at angle {angle:.2f}: [{lng_val}, {lat_val}]")
+            logger.warning("Mock coordinate out of range at angle %.2f: [%s, %s]", 2 * math.pi * i / _MOCK_NUM_POINTS, lng_val, lat_val)
+            dropped_points += 1
             continue
         
         coordinates.append([lng_val, lat_val])
     
     if len(coordinates) < 3:
-        logger.error(f"Mock polygon generation failed: only {len(coordinates)} valid coordinates")
+        logger.error("Mock polygon generation failed: only %s valid coordinates", len(coordinates))
         raise ValueError(f"Failed to generate valid mock polygon: only {len(coordinates)} coordinates")
     
     # Ensure polygon is closed
-    if coordinates[0] != coordinates[-1]:
-        coordinates.append(coordinates[0])
+    first, last = coordinates[0], coordinates[-1]
+    if first[0] != last[0] or first[1] != last[1]:
+        coordinates.append(first)
         logger.debug("Mock polygon was not closed, added closing point")
     
-    logger.info(f"Generated {len(coordinates)} coordinates for mock polygon")
-    logger.debug(f"Mock coordinate bounds - Lng: [{min(c[0] for c in coordinates):.6f}, {max(c[0] for c in coordinates):.6f}], Lat: [{min(c[1] for c in coordinates):.6f}, {max(c[1] for c in coordinates):.6f}]")
+    logger.info("Generated %s coordinates for mock polygon", len(coordinates))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Mock coordinate bounds - Lng: [%.6f, %.6f], Lat: [%.6f, %.6f]", min(c[0] for c in coordinates), max(c[0] for c in coordinates), min(c[1] for c in coordinates), max(c[1] for c in coordinates))
     
-    # Validate that the center point is within the mock polygon (it should always be for a circle)
+    # Validate that the center point is within the mock polygon. A full ring of
+    # samples is a regular polygon around the center, so it encloses it by
+    # construction; only a ring with out-of-range points dropped needs the ray cast
     center_lng = float(lng)
     center_lat = float(lat)
-    center_in_polygon = _point_in_polygon(center_lng, center_lat, coordinates)
+    if dropped_points == 0:
+        center_in_polygon = True
+    else:
+        center_in_polygon = _point_in_polygon(center_lng, center_lat, coordinates)
     
     if not center_in_polygon:
         logger.warning(
-            f"WARNING: Center point ({center_lat}, {center_lng}) is NOT within the mock isochrone polygon. "
-            f"This should not happen for a circular polygon. Check coordinate calculations."
+            "WARNING: Center point (%s, %s) is NOT within the mock isochrone polygon. "
+            "This should not happen for a circular polygon. Check coordinate calculations.",
+            center_lat, center_lng,
         )
     else:
-        logger.debug(f"Mock polygon center validation: Center point is within polygon ✓")
+        logger.debug("Mock polygon center validation: Center point is within polygon ✓")
     
     geojson = {
         "type": "Feature",
@@ -710,6 +1248,6 @@ def _get_mock_polygon(lat: float, lng: float, minutes: int) -> Dict[str, Any]:
         }
     }
     
-    logger.info(f"Generated mock isochrone for {minutes} minutes at ({lat}, {lng}) with {len(coordinates)} points")
-    logger.debug(f"Mock GeoJSON structure: type={geojson['type']}, geometry.type={geojson['geometry']['type']}, coordinates.rings={len(geojson['geometry']['coordinates'])}")
+    logger.info("Generated mock isochrone for %s minutes at (%s, %s) with %s points", minutes, lat, lng, len(coordinates))
+    logger.debug("Mock GeoJSON structure: type=%s, geometry.type=%s, coordinates.rings=%s", geojson['type'], geojson['geometry']['type'], len(geojson['geometry']['coordinates']))
     return geojson
@@ -2,13 +2,19 @@
 FastAPI main application for Site Scout Lite.
 Serves API endpoints and static frontend files.
 """
+import asyncio
+import hashlib
 import logging
+import re
 from datetime import date, timedelta
-from fastapi import FastAPI, Query, HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from fastapi import FastAPI, Query, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
 import sys
 import os
 import requests
@@ -16,20 +22,33 @@ import requests
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from sam_client import fetch_projects, fetch_live_projects
-from iso_client import get_isochrone
-from places_client import search_places
+from sam_client import fetch_projects, fetch_live_projects, get_stale_live_projects
+from iso_client import get_isochrone_bytes
+from places_client import search_places, search_places_many
 from config import GOOGLE_MAPS_API_KEY
 
-# Configure structured logging - set to DEBUG to see detailed diagnostic info
+# Configure structured logging - set LOG_LEVEL=DEBUG to see detailed diagnostic info
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Live SAM.gov calls run on their own bounded pool: it keeps them off the event
+# loop without letting a burst of dashboard loads flood SAM.gov's rate limit
+# or starve the default executor used by the other endpoints
+_SAM_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sam")
+
+# Live SAM.gov calls currently running, keyed by their query, so concurrent
+# identical requests (e.g. several open tabs) share one upstream call
+_SAM_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+# SAM.gov client errors that mean "rate limited" (mapped to HTTP 429)
+_RATE_LIMIT_RE = re.compile(r"rate limit|429|too many requests", re.IGNORECASE)
+
 # Create FastAPI app
-app = FastAPI(title="Site Scout Lite API", version="1.0.0")
+# ORJSONResponse: encode API responses with orjson instead of the stdlib json module
+app = FastAPI(title="Site Scout Lite API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Enable CORS for frontend access
 app.add_middleware(
@@ -41,35 +60,87 @@ app.add_middleware(
 )
 
 # Mount static files (frontend)
-frontend_path = os.path.join(os.path.dirname(__file__), "..", "frontend")
+# Resolved to a normalized absolute path once, at import
+frontend_path = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend"))
 if os.path.exists(frontend_path):
     app.mount("/static", StaticFiles(directory=frontend_path), name="static")
+FRONTEND_INDEX_FILE = os.path.join(frontend_path, "index.html")
+
+
+@lru_cache(maxsize=1)
+def _render_index_html(mtime_ns: int) -> Tuple[bytes, str]:
+    """
+    Read index.html and inject the Google Maps API key.
+    Cached per file modification time, so the read and substitution happen
+    once instead of on every page load, yet edits to the file still show up.
+    
+    Returns:
+        (html, etag) - the encoded page, ready to send as-is, and a hash of it
+    """
+    # Work on the raw bytes so the page is never decoded and re-encoded
+    with open(FRONTEND_INDEX_FILE, "rb") as f:
+        html_content = f.read()
+    
+    # Replace the placeholder API key with the actual key from environment
+    api_key = GOOGLE_MAPS_API_KEY
+    if not api_key:
+        logger.error("GOOGLE_MAPS_API_KEY is not set in .env file. Google Maps will not work.")
+        # Don't use placeholder - let it fail clearly
+        api_key = ""
+    else:
+        logger.info("Injecting Google Maps API key into frontend")
+    
+    html_content = api_key.encode("utf-8").join(html_content.split(b"YOUR_API_KEY"))
+    etag = '"' + hashlib.sha1(html_content).hexdigest() + '"'
+    return html_content, etag
 
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the main index.html file with Google Maps API key injected"""
-    frontend_file = os.path.join(os.path.dirname(__file__), "..", "frontend", "index.html")
-    if os.path.exists(frontend_file):
-        # Read the HTML file
-        with open(frontend_file, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        
-        # Replace the placeholder API key with the actual key from environment
-        api_key = GOOGLE_MAPS_API_KEY
-        if not api_key:
-            logger.error("GOOGLE_MAPS_API_KEY is not set in .env file. Google Maps will not work.")
-            # Don't use placeholder - let it fail clearly
-            api_key = ""
-        else:
-            logger.info("Injecting Google Maps API key into frontend")
-        
-        html_content = html_content.replace("YOUR_API_KEY", api_key)
-        
-        # Return the modified HTML
-        from fastapi.responses import HTMLResponse
-        return HTMLResponse(content=html_content)
-    return {"message": "Frontend not found"}
+    try:
+        mtime_ns = os.stat(FRONTEND_INDEX_FILE).st_mtime_ns
+    except OSError:
+        return {"message": "Frontend not found"}
+    html_content, etag = _render_index_html(mtime_ns)
+    # Let browsers revalidate instead of re-downloading an unchanged page
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=html_content, media_type="text/html; charset=utf-8", headers=headers)
+
+
+async def _fetch_live_projects_shared(sam_query: dict) -> List[dict]:
+    """
+    Run fetch_live_projects on the SAM.gov pool, joining an identical call
+    that is already in flight instead of starting a second one.
+    """
+    key = tuple(sorted(sam_query.items()))
+    future = _SAM_INFLIGHT.get(key)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_SAM_EXECUTOR, partial(fetch_live_projects, **sam_query))
+        _SAM_INFLIGHT[key] = future
+        future.add_done_callback(lambda _: _SAM_INFLIGHT.pop(key, None))
+    else:
+        logger.info("Joining in-flight SAM.gov request for the same query")
+    # Shield so one client disconnecting doesn't cancel the call for the others
+    return await asyncio.shield(future)
+
+
+def _stale_projects_response(sam_query: Optional[dict], error: Exception) -> Optional[ORJSONResponse]:
+    """
+    Build a response from the last good SAM.gov result for this query, if any,
+    so the dashboard keeps working while SAM.gov is rate limiting or down.
+    The response is marked with an "X-Cache: stale" header.
+    """
+    if not sam_query:
+        return None
+    projects = get_stale_live_projects(**sam_query)
+    if projects is None:
+        return None
+    logger.warning("SAM.gov call failed (%s); returning %d stale cached projects", error, len(projects))
+    return ORJSONResponse(content=projects, headers={"X-Cache": "stale"})
 
 
 @app.get("/api/health")
@@ -115,15 +186,18 @@ async def get_projects(
     """
     if mock:
         # Use mock data from sample_sam.json only when explicitly requested
-        projects = fetch_projects(mock=True)
-        logger.info(f"Returning {len(projects)} mock projects (mock=true)")
-        return projects
+        projects = await asyncio.to_thread(fetch_projects, mock=True)
+        logger.info("Returning %d mock projects (mock=true)", len(projects))
+        # Projects are plain JSON data, so hand them straight to orjson
+        # instead of through FastAPI's jsonable_encoder pass
+        return ORJSONResponse(content=projects)
     else:
         # Default: Use live SAM.gov API with date range (last 90 days)
         # No fallback to mock - errors should be raised
         today = date.today()
         posted_to = today
         posted_from = today - timedelta(days=90)
+        sam_query = None
         
         try:
             # Determine search type and extract query - handle None and empty strings safely
@@ -142,12 +216,12 @@ async def get_projects(
             if search_query:
                 if search_type_lower == "naics":
                     naics_query = search_query
-                    logger.info(f"Searching by NAICS code: {naics_query}")
+                    logger.info("Searching by NAICS code: %s", naics_query)
                 else:
                     keyword_query = search_query
-                    logger.info(f"Searching by keyword: {keyword_query}")
+                    logger.info("Searching by keyword: %s", keyword_query)
             
-            projects = fetch_live_projects(
+            sam_query = dict(
                 posted_from=posted_from,
                 posted_to=posted_to,
                 limit=50,
@@ -155,23 +229,22 @@ async def get_projects(
                 naics_code=naics_query,
                 ptype="a"  # Award Notice type
             )
+            # The SAM.gov client (and the geocoding it does) blocks on network I/O,
+            # so run it on the dedicated SAM.gov pool to keep the event loop free
+            projects = await _fetch_live_projects_shared(sam_query)
             
             search_desc = f"{search_type_lower}: {search_query}" if search_query else "all"
-            logger.info(f"Returning {len(projects)} live projects from SAM.gov ({search_desc})")
-            return projects
+            logger.info("Returning %d live projects from SAM.gov (%s)", len(projects), search_desc)
+            return ORJSONResponse(content=projects)
         except RuntimeError as e:
             # RuntimeError from SAM client (e.g., missing API key, rate limit)
-            logger.error(f"Runtime error in /api/projects: {e}")
+            logger.error("Runtime error in /api/projects: %s", e)
             # Check if it's a rate limit error
-            error_msg = str(e).lower()
-            logger.debug(f"Error message (lowercased): {error_msg}")
-            is_rate_limit = (
-                "rate limit" in error_msg or 
-                "429" in error_msg or 
-                "too many requests" in error_msg or
-                "rate limit exceeded" in error_msg
-            )
-            logger.debug(f"Is rate limit error: {is_rate_limit}")
+            is_rate_limit = bool(_RATE_LIMIT_RE.search(str(e)))
+            logger.debug("Is rate limit error: %s", is_rate_limit)
+            stale_response = _stale_projects_response(sam_query, e)
+            if stale_response is not None:
+                return stale_response
             if is_rate_limit:
                 logger.info("Returning 429 status code for rate limit error")
                 raise HTTPException(status_code=429, detail=str(e))
@@ -180,7 +253,10 @@ async def get_projects(
         except requests.exceptions.HTTPError as e:
             # HTTP errors from SAM.gov API
             status_code = e.response.status_code if e.response else 500
-            logger.error(f"HTTP error calling SAM.gov API: {status_code} - {e}")
+            logger.error("HTTP error calling SAM.gov API: %s - %s", status_code, e)
+            stale_response = _stale_projects_response(sam_query, e)
+            if stale_response is not None:
+                return stale_response
             # Preserve the original status code if it's a client error (4xx)
             if status_code and 400 <= status_code < 500:
                 raise HTTPException(
@@ -193,25 +269,28 @@ async def get_projects(
             )
         except requests.exceptions.RequestException as e:
             # Network/timeout errors
-            logger.error(f"Network error calling SAM.gov API: {e}")
+            logger.error("Network error calling SAM.gov API: %s", e)
+            stale_response = _stale_projects_response(sam_query, e)
+            if stale_response is not None:
+                return stale_response
             raise HTTPException(
                 status_code=500,
                 detail=f"Network error connecting to SAM.gov API: {str(e)}"
             )
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.error(f"Unexpected error in /api/projects (live mode): {e}", exc_info=True)
+            logger.error("Unexpected error in /api/projects (live mode): %s", e, exc_info=True)
             import traceback
             error_detail = f"Error fetching projects from SAM.gov: {str(e)}"
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            logger.error("Full traceback:\n%s", traceback.format_exc())
             raise HTTPException(status_code=500, detail=error_detail)
 
 
 @app.get("/api/isochrones")
 async def get_isochrones(
-    lat: float = Query(..., description="Latitude"),
-    lng: float = Query(..., description="Longitude"),
-    minutes: int = Query(30, description="Travel time in minutes (30, 45, or 60)"),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    minutes: int = Query(30, ge=30, le=60, multiple_of=15, description="Travel time in minutes (30, 45, or 60)"),
     mock: Optional[bool] = Query(False, description="Use mock data (set to 'true' for mock mode)")
 ):
     """
@@ -226,28 +305,16 @@ async def get_isochrones(
     Returns:
         GeoJSON Feature with polygon geometry
     """
+    # minutes and the coordinate ranges are validated by FastAPI (422 on bad input)
     try:
-        # Validate minutes
-        if minutes not in [30, 45, 60]:
-            raise HTTPException(
-                status_code=400,
-                detail="minutes must be 30, 45, or 60"
-            )
-        
-        # Validate coordinates
-        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid coordinates"
-            )
-        
-        isochrone = get_isochrone(lat, lng, minutes, mock=mock)
-        logger.info(f"Generated isochrone for ({lat}, {lng}), {minutes} min (mock={mock})")
-        return isochrone
+        # Already-serialized GeoJSON, so FastAPI doesn't re-encode every coordinate
+        isochrone = await asyncio.to_thread(get_isochrone_bytes, lat, lng, minutes, mock=mock)
+        logger.info("Generated isochrone for (%s, %s), %s min (mock=%s)", lat, lng, minutes, mock)
+        return Response(content=isochrone, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /api/isochrones: {e}")
+        logger.error("Error in /api/isochrones: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating isochrone: {str(e)}")
 
 
@@ -264,19 +331,60 @@ async def get_places(
         mock: Optional query parameter. Set to 'true' to use mock data
         
     Returns:
-        List of places with name, lat, lng
+        List of places with name, address, lat, lng
     """
     try:
         if not q or not q.strip():
             raise HTTPException(status_code=400, detail="Query parameter 'q' is required")
         
-        places = search_places(q.strip(), mock=mock)
-        logger.info(f"Found {len(places)} places for query: {q} (mock={mock})")
-        return places
+        places = await asyncio.to_thread(search_places, q.strip(), mock=mock)
+        logger.info("Found %d places for query: %s (mock=%s)", len(places), q, mock)
+        # orjson serializes the Place dataclasses directly; skip jsonable_encoder
+        return ORJSONResponse(content=places)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in /api/places: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error searching places: {str(e)}")
+
+
+# Each distinct query is a billed Google Places call, so cap the fan-out of
+# a single batch request (FastAPI answers 422 above the cap)
+MAX_PLACES_BATCH_QUERIES = 20
+
+
+class PlacesBatchRequest(BaseModel):
+    """Request body for /api/places/batch"""
+    queries: List[str] = Field(..., min_length=1, max_length=MAX_PLACES_BATCH_QUERIES)
+
+
+@app.post("/api/places/batch")
+async def get_places_batch(
+    body: PlacesBatchRequest,
+    mock: Optional[bool] = Query(False, description="Use mock data (set to 'true' for mock mode)")
+):
+    """
+    Run several competitor searches in one request, concurrently.
+    
+    Args:
+        body: {"queries": ["Vulcan Materials", "Martin Marietta", ...]}
+        mock: Optional query parameter. Set to 'true' to use mock data
+        
+    Returns:
+        List of {"query": ..., "results": [places]} in request order
+    """
+    try:
+        queries = [q.strip() for q in body.queries if q and q.strip()]
+        if not queries:
+            raise HTTPException(status_code=400, detail="At least one non-empty query is required")
+        
+        results = await search_places_many(queries, mock=mock)
+        logger.info("Batch places search: %d queries (mock=%s)", len(queries), mock)
+        return ORJSONResponse(content=[{"query": q, "results": results[q]} for q in queries])
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in /api/places: {e}")
+        logger.error("Error in /api/places/batch: %s", e)
         raise HTTPException(status_code=500, detail=f"Error searching places: {str(e)}")
 
 
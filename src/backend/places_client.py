@@ -1,25 +1,105 @@
 """
 Google Places API client for competitor facility lookup.
-Uses Google Places TextSearch API to find competitor locations.
+Uses the Google Places API (New) Text Search to find competitor locations.
 """
+import asyncio
 import logging
-from typing import List, Dict, Any
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Iterable, Optional, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import GOOGLE_MAPS_API_KEY
 
 logger = logging.getLogger(__name__)
 
+PLACES_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
 
-def search_places(query: str, mock: bool = False) -> List[Dict[str, Any]]:
+# Ask only for the fields we return: it keeps responses small and the
+# request on the cheapest Text Search SKU that covers them
+_FIELD_MASK = "places.displayName,places.formattedAddress,places.location"
+
+# The API key is fixed for the process, so build the request headers once
+_SEARCH_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Goog-Api-Key": GOOGLE_MAPS_API_KEY or "",
+    "X-Goog-FieldMask": _FIELD_MASK,
+}
+
+# Shared session so repeated searches reuse keep-alive TLS connections
+# to places.googleapis.com. searchText is a read-only POST, so it is safe to
+# retry (urllib3 skips POST unless it is listed in allowed_methods)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+    ),
+))
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    """
+    A single place result. Immutable, so cached and mock results can be
+    handed out without copying; orjson serializes it as a plain object.
     """
-    Search for places using Google Places TextSearch API.
+    name: str
+    address: str
+    lat: float
+    lng: float
+
+
+# Caching mechanism for Google Places results, keyed by normalized query text.
+# Dashboard searches repeat a handful of competitor names, so this saves
+# both latency and billed Places calls
+_cache = {}
+_cache_ttl = 3600  # 1 hour cache TTL
+_cache_max_size = 512
+
+
+def _cache_key(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+
+def _get_cached_places(cache_key: str) -> Optional[List[Place]]:
+    """Get cached places if still valid"""
+    if cache_key in _cache:
+        cached_time, cached_places = _cache[cache_key]
+        if time.time() - cached_time < _cache_ttl:
+            logger.info("Returning cached Google Places results for: '%s'", cache_key)
+            # Places are immutable, so only the list needs copying
+            return list(cached_places)
+        else:
+            _cache.pop(cache_key, None)
+            logger.debug("Cache expired for: '%s'", cache_key)
+    return None
+
+
+def _set_cached_places(cache_key: str, places: List[Place]):
+    """Cache successful live results (fallback mock data is never cached)"""
+    if len(_cache) >= _cache_max_size:
+        # Evict the oldest entry (dicts keep insertion order)
+        _cache.pop(next(iter(_cache)), None)
+    _cache[cache_key] = (time.time(), tuple(places))
+
+
+def search_places(query: str, mock: bool = False) -> List[Place]:
+    """
+    Search for places using Google Places API (New) Text Search.
     
     Args:
         query: Search query string (e.g., "Vulcan Materials")
         mock: If True, return mock data instead of calling API
         
     Returns:
-        Simplified list of places:
+        Simplified list of places, which serialize as:
         [
             {
                 "name": "Vulcan Materials",
@@ -37,74 +117,122 @@ def search_places(query: str, mock: bool = False) -> List[Dict[str, Any]]:
         logger.warning("GOOGLE_MAPS_API_KEY not configured, using mock data")
         return _get_mock_places(query)
     
+    cache_key = _cache_key(query)
+    cached_places = _get_cached_places(cache_key)
+    if cached_places is not None:
+        return cached_places
+    
     try:
-        # Google Places TextSearch API endpoint
-        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        body = orjson.dumps({"textQuery": query.strip(), "regionCode": "US"})
+        response = _SESSION.post(PLACES_SEARCH_URL, data=body, headers=_SEARCH_HEADERS, timeout=15)
         
-        params = {
-            "query": query.strip(),
-            "key": GOOGLE_MAPS_API_KEY,
-            "region": "us"  # Bias to US results
-        }
-        
-        response = requests.get(url, params=params, timeout=15)
-        response.raise_for_status()
+        # The new Places API reports errors through the HTTP status. A 4xx
+        # (bad key, or Places API (New) not enabled on it) won't fix itself,
+        # so return nothing rather than mock data that looks like real results
+        if 400 <= response.status_code < 500:
+            logger.error(
+                "Google Places API rejected the request with HTTP %s "
+                "(is Places API (New) enabled for this key?): %s",
+                response.status_code, response.text[:200],
+            )
+            return []
+        if response.status_code != 200:
+            logger.warning("Google Places API returned HTTP %s: %s", response.status_code, response.text[:200])
+            return _get_mock_places(query)
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Check API response status
-        status = data.get("status")
-        if status != "OK":
-            error_message = data.get("error_message", "Unknown error")
-            logger.warning(f"Google Places API returned status: {status} - {error_message}")
+        # An empty body means no matches
+        results = data.get("places")
+        if not results:
+            logger.warning("Google Places API returned no results for query: '%s'", query)
             return _get_mock_places(query)
         
+        # The field mask already limits each result to the four fields the
+        # frontend reads; type checks skip a malformed result cheaply without
+        # losing the rest of the response
         places = []
-        results = data.get("results", [])
-        
         for result in results:
-            try:
-                # Extract location from geometry
-                geometry = result.get("geometry", {})
-                location = geometry.get("location", {})
-                
-                lat = location.get("lat")
-                lng = location.get("lng")
-                
-                # Only include places with valid coordinates
-                if lat is not None and lng is not None:
-                    # Extract formatted address from result
-                    address = result.get("formatted_address", "")
-                    
-                    place = {
-                        "name": result.get("name", "Unknown"),
-                        "address": address,
-                        "lat": float(lat),
-                        "lng": float(lng)
-                    }
-                    places.append(place)
-            except (ValueError, TypeError, KeyError) as e:
-                logger.debug(f"Error processing place result: {e}")
+            if not isinstance(result, dict):
+                continue
+            location = result.get("location") or {}
+            lat = location.get("latitude")
+            lng = location.get("longitude")
+            
+            # Only include places with valid coordinates
+            if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
                 continue
+            display_name = result.get("displayName") or {}
+            places.append(Place(
+                display_name.get("text", "Unknown"),
+                result.get("formattedAddress", ""),
+                float(lat),
+                float(lng),
+            ))
         
-        logger.info(f"Found {len(places)} places for query: '{query}'")
+        logger.info("Found %d places for query: '%s'", len(places), query)
+        _set_cached_places(cache_key, places)
         return places
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching places from Google Places API: {e}")
-        logger.info("Falling back to mock data")
-        return _get_mock_places(query)
-    except KeyError as e:
-        logger.error(f"Unexpected response structure from Google Places API: {e}")
+        logger.error("Error fetching places from Google Places API: %s", e)
         logger.info("Falling back to mock data")
         return _get_mock_places(query)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        # A response we can't parse came from the live API: return nothing
+        # rather than mock data that would pass for real results
+        logger.error("Unexpected response structure from Google Places API: %s", e)
+        return []
     except Exception as e:
-        logger.error(f"Unexpected error in places client: {e}")
+        logger.error("Unexpected error in places client: %s", e)
         logger.info("Falling back to mock data")
         return _get_mock_places(query)
 
 
-def _get_mock_places(query: str) -> List[Dict[str, Any]]:
+# Sample competitor locations in Virginia
+_MOCK_COMPETITORS: Tuple[Place, ...] = (
+    Place("Vulcan Materials - Richmond", "Richmond, VA 23220", 37.5407, -77.4360),
+    Place("Martin Marietta - Norfolk", "Norfolk, VA 23510", 36.8468, -76.2852),
+    Place("LafargeHolcim - Roanoke", "Roanoke, VA 24011", 37.2710, -79.9414),
+    Place("Cemex - Alexandria", "Alexandria, VA 22314", 38.8048, -77.0469),
+    Place("Vulcan Materials - Virginia Beach", "Virginia Beach, VA 23451", 36.8529, -75.9780),
+    Place("Martin Marietta - Charlottesville", "Charlottesville, VA 22903", 38.0293, -78.4767),
+)
+# Lowercased names for case-insensitive query matching, computed once
+_MOCK_NAMES_LOWER = tuple(comp.name.lower() for comp in _MOCK_COMPETITORS)
+
+
+async def search_places_many(
+    queries: Iterable[str],
+    mock: bool = False,
+    concurrency: int = 8,
+) -> Dict[str, List[Place]]:
+    """
+    Run several place searches concurrently with bounded parallelism.
+    
+    Each search runs search_places in a worker thread, so results share the
+    query cache and the pooled session with single searches.
+    
+    Args:
+        queries: Search query strings (duplicates are searched once)
+        mock: If True, return mock data instead of calling API
+        concurrency: Maximum number of searches in flight at once
+        
+    Returns:
+        Dictionary mapping each query to its list of places
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _search(query: str) -> List[Place]:
+        async with semaphore:
+            return await asyncio.to_thread(search_places, query, mock)
+    
+    unique_queries = list(dict.fromkeys(queries))
+    results = await asyncio.gather(*(_search(q) for q in unique_queries))
+    return dict(zip(unique_queries, results))
+
+
+def _get_mock_places(query: str) -> List[Place]:
     """
     Return mock competitor data for testing.
     All locations are in Virginia.
@@ -115,27 +243,17 @@ def _get_mock_places(query: str) -> List[Dict[str, Any]]:
     Returns:
         List of places with name, address, lat, lng
     """
-    # Sample competitor locations in Virginia
-    mock_competitors = [
-        {"name": "Vulcan Materials - Richmond", "address": "Richmond, VA 23220", "lat": 37.5407, "lng": -77.4360},
-        {"name": "Martin Marietta - Norfolk", "address": "Norfolk, VA 23510", "lat": 36.8468, "lng": -76.2852},
-        {"name": "LafargeHolcim - Roanoke", "address": "Roanoke, VA 24011", "lat": 37.2710, "lng": -79.9414},
-        {"name": "Cemex - Alexandria", "address": "Alexandria, VA 22314", "lat": 38.8048, "lng": -77.0469},
-        {"name": "Vulcan Materials - Virginia Beach", "address": "Virginia Beach, VA 23451", "lat": 36.8529, "lng": -75.9780},
-        {"name": "Martin Marietta - Charlottesville", "address": "Charlottesville, VA 22903", "lat": 38.0293, "lng": -78.4767},
-    ]
-    
     # Filter by query if provided
     if query and query.strip():
         query_lower = query.strip().lower()
         filtered = [
-            comp for comp in mock_competitors
-            if query_lower in comp["name"].lower()
+            comp for comp, name_lower in zip(_MOCK_COMPETITORS, _MOCK_NAMES_LOWER)
+            if query_lower in name_lower
         ]
         if filtered:
-            logger.info(f"Mock: Found {len(filtered)} places matching query '{query}'")
+            logger.info("Mock: Found %d places matching query '%s'", len(filtered), query)
             return filtered
     
     # Return first 3 if no query match or no query
-    logger.info(f"Mock: Returning {min(3, len(mock_competitors))} default competitor locations")
-    return mock_competitors[:3]
+    logger.info("Mock: Returning %s default competitor locations", min(3, len(_MOCK_COMPETITORS)))
+    return list(_MOCK_COMPETITORS[:3])
@@ -3,62 +3,129 @@ SAM.gov API client for fetching federal contract opportunities.
 Uses SAM.gov v2 API endpoint with geocoding support.
 Returns simplified, business-focused project objects.
 """
-import json
 import logging
 import os
+import re
+import sys
+import threading
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
+import orjson
 import requests
-from config import SAM_BASE_URL, SAM_API_KEY, NAICS_CODES, STATE_FILTER
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import SAM_BASE_URL, SAM_API_KEY, NAICS_CODES, STATE_FILTER, SAM_GEOCODE_PARALLELISM
 from geocode_client import geocode_address
 
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated SAM.gov searches reuse keep-alive TLS connections.
+# Only gateway errors are retried. 429s and 500s are not: SAM.gov uses them for
+# quota exhaustion (500s are often a disguised rate limit or a bad parameter),
+# so retrying would burn the daily quota and delay the error handling below
+# that reports them (and that callers fall back to stale data for).
+# raise_on_status=False hands the last response back so raise_for_status()
+# still surfaces the real HTTP error after retries run out
+_SESSION = requests.Session()
+_SESSION.headers["Accept"] = "application/json"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    ),
+))
+
 # Caching mechanism for SAM.gov API responses
 _cache = {}
 _cache_ttl = 300  # 5 minutes cache TTL
+# Expired entries are kept this long so callers can fall back to the last
+# good response while SAM.gov is rate limiting or down
+_stale_cache_ttl = 24 * 3600  # 24 hours
 
 # Request throttling to avoid hitting rate limits
 _last_request_time = 0
 _min_request_interval = 2  # Minimum seconds between requests
+# Guards _last_request_time: live fetches run on a thread pool in main.py
+_throttle_lock = threading.Lock()
+
+# Currency symbols, thousands separators and spaces in award amount strings
+_AMOUNT_NOISE_RE = re.compile(r"[,\s$]")
+
+# Accepted spellings of the state filter, after upper-casing
+_VIRGINIA_STATE_NAMES = frozenset({"VA", "VIRGINIA"})
+
+# Marks an optional normalize_sam_opportunity argument the caller didn't
+# compute (None is a real value for both coordinates and address)
+_UNSET: Any = object()
 
-LATITUDE_KEYS = {"lat", "latitude", "lat_deg", "latdeg", "y", "ycoord", "geo_lat", "center_lat"}
-LONGITUDE_KEYS = {"lng", "lon", "long", "longitude", "long_deg", "longdeg", "x", "xcoord", "geo_lng", "center_lng"}
+LATITUDE_KEYS = frozenset({"lat", "latitude", "lat_deg", "latdeg", "y", "ycoord", "geo_lat", "center_lat"})
+LONGITUDE_KEYS = frozenset({"lng", "lon", "long", "longitude", "long_deg", "longdeg", "x", "xcoord", "geo_lng", "center_lng"})
+_COORDINATE_KEYS = LATITUDE_KEYS | LONGITUDE_KEYS
 
 
-def _get_cached_response(cache_key: str) -> Optional[List[dict]]:
-    """Get cached response if still valid"""
+def _get_cached_response(cache_key: str, max_age: float = _cache_ttl) -> Optional[List[dict]]:
+    """Get cached response if it is younger than max_age seconds"""
     if cache_key in _cache:
         cached_time, cached_data = _cache[cache_key]
-        if time.time() - cached_time < _cache_ttl:
-            logger.info(f"Returning cached SAM.gov response for: {cache_key[:50]}...")
+        age = time.time() - cached_time
+        if age < max_age:
+            logger.info("Returning cached SAM.gov response for: %s...", cache_key[:50])
             return cached_data
-        else:
-            del _cache[cache_key]
-            logger.debug(f"Cache expired for: {cache_key[:50]}...")
+        elif age >= _stale_cache_ttl:
+            _cache.pop(cache_key, None)
+        logger.debug("Cache expired for: %s...", cache_key[:50])
     return None
 
 
+def _projects_cache_key(
+    posted_from: date,
+    posted_to: date,
+    limit: int,
+    keyword: Optional[str],
+    naics_code: Optional[str],
+    ptype: Optional[str],
+) -> str:
+    # Built from the query parameters only (never the API key)
+    return f"{keyword}_{naics_code}_{posted_from}_{posted_to}_{limit}_{ptype}"
+
+
 def _set_cached_response(cache_key: str, data: List[dict]):
     """Cache a response"""
     _cache[cache_key] = (time.time(), data)
-    logger.debug(f"Cached SAM.gov response for: {cache_key[:50]}...")
+    logger.debug("Cached SAM.gov response for: %s...", cache_key[:50])
 
 
 def _throttle_request():
     """Throttle requests to avoid hitting rate limits"""
     global _last_request_time
-    time_since_last = time.time() - _last_request_time
-    if time_since_last < _min_request_interval:
-        wait_time = _min_request_interval - time_since_last
-        logger.debug(f"Throttling SAM.gov request: waiting {wait_time:.2f} seconds")
+    # Reserve the next free slot under the lock so concurrent callers each get
+    # their own slot, then sleep outside it so waiters don't block each other
+    with _throttle_lock:
+        now = time.time()
+        slot = max(now, _last_request_time + _min_request_interval)
+        _last_request_time = slot
+    wait_time = slot - now
+    if wait_time > 0:
+        logger.debug("Throttling SAM.gov request: waiting %.2f seconds", wait_time)
         time.sleep(wait_time)
-    _last_request_time = time.time()
 
 
 def _coerce_float(value: Any) -> Optional[float]:
+    # Numeric JSON values are by far the common case; exact type checks
+    # skip the constructor call and try/except setup for them
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
     try:
         if value is None or value == "":
             return None
@@ -69,33 +136,47 @@ def _coerce_float(value: Any) -> Optional[float]:
 
 def _find_coordinates_in_structure(value: Any) -> Optional[Tuple[float, float]]:
     """
-    Recursively search a nested SAM.gov structure for latitude/longitude pairs.
+    Search a nested SAM.gov structure for latitude/longitude pairs.
+    Walks depth-first with an explicit stack (children pushed in reverse so
+    they're visited in document order), avoiding a Python call per node.
     """
-    if isinstance(value, dict):
-        lat = None
-        lng = None
-        for key, val in value.items():
-            key_lower = key.lower()
-            if key_lower in LATITUDE_KEYS and lat is None:
-                lat = _coerce_float(val)
-            elif key_lower in LONGITUDE_KEYS and lng is None:
-                lng = _coerce_float(val)
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            # Most dicts have no coordinate-like key at all; rule them out
+            # with one C-level pass before scanning keys in Python
+            if not _COORDINATE_KEYS.isdisjoint(map(str.lower, node)):
+                lat = None
+                lng = None
+                for key, val in node.items():
+                    key_lower = key.lower()
+                    if key_lower in LATITUDE_KEYS and lat is None:
+                        lat = _coerce_float(val)
+                    elif key_lower in LONGITUDE_KEYS and lng is None:
+                        lng = _coerce_float(val)
+
+                if lat is not None and lng is not None:
+                    return lat, lng
+
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
 
-        if lat is not None and lng is not None:
-            return lat, lng
-
-        for nested in value.values():
-            coords = _find_coordinates_in_structure(nested)
-            if coords:
-                return coords
+    return None
 
-    elif isinstance(value, list):
-        for item in value:
-            coords = _find_coordinates_in_structure(item)
-            if coords:
-                return coords
 
-    return None
+# Fields most likely to carry coordinates, searched (in order) before the rest of the item
+_COORDINATE_FIELDS = (
+    "placeOfPerformance",
+    "place_of_performance",
+    "officeAddress",
+    "office_address",
+    "pointOfContact",
+    "additionalPOCLocation",
+    "location",
+)
+_COORDINATE_FIELDS_SET = frozenset(_COORDINATE_FIELDS)
 
 
 def extract_coordinates_from_item(item: dict) -> Optional[Tuple[float, float]]:
@@ -105,17 +186,8 @@ def extract_coordinates_from_item(item: dict) -> Optional[Tuple[float, float]]:
     if not isinstance(item, dict):
         return None
 
-    possible_fields = [
-        item.get("placeOfPerformance"),
-        item.get("place_of_performance"),
-        item.get("officeAddress"),
-        item.get("office_address"),
-        item.get("pointOfContact"),
-        item.get("additionalPOCLocation"),
-        item.get("location"),
-    ]
-
-    for field in possible_fields:
+    for name in _COORDINATE_FIELDS:
+        field = item.get(name)
         if isinstance(field, str):
             # Strings (e.g., "VA") won't contain coordinates
             continue
@@ -123,8 +195,41 @@ def extract_coordinates_from_item(item: dict) -> Optional[Tuple[float, float]]:
         if coords:
             return coords
 
-    # Fallback: search entire item
-    return _find_coordinates_in_structure(item)
+    # Fallback: search the rest of the item. The fields above are already
+    # known not to contain coordinates, so they aren't walked a second time
+    return _find_coordinates_in_structure(
+        {key: val for key, val in item.items() if key not in _COORDINATE_FIELDS_SET}
+    )
+
+
+# Where a SAM.gov item's location may live, in order of preference
+_LOCATION_SOURCE_FIELDS = ("placeOfPerformance", "officeAddress", "pointOfContact")
+# Shared read-only stand-in for a missing location (never mutated)
+_EMPTY_LOCATION: Dict[str, Any] = {}
+
+
+def _location_value(field: Any, *keys: str) -> Any:
+    """
+    Read a location component that SAM.gov sends either as a plain string
+    or as a dict such as {"code": "VA", "name": "Virginia"}.
+    
+    Args:
+        field: The raw field value
+        keys: Dict keys to try, in order of preference
+        
+    Returns:
+        The stripped string (None if blank), the first truthy dict value
+        (else the last one tried), or None
+    """
+    if isinstance(field, str):
+        return field.strip() or None
+    value = None
+    if isinstance(field, dict):
+        for key in keys:
+            value = field.get(key)
+            if value:
+                break
+    return value
 
 
 def extract_location_fields(item: dict) -> Dict[str, Optional[str]]:
@@ -138,64 +243,35 @@ def extract_location_fields(item: dict) -> Dict[str, Optional[str]]:
     Returns:
         Dictionary with city, state, zipcode, country fields
     """
-    # Try placeOfPerformance first (most accurate for project location)
-    pop = item.get("placeOfPerformance")
-
-    # SAM.gov might return placeOfPerformance as a string ("VA") instead of object
-    # If it's a string, it's just the state code - we need to get address from elsewhere
-    if isinstance(pop, str):
-        logger.debug(f"placeOfPerformance is string: '{pop}' - trying officeAddress")
-        pop = item.get("officeAddress")
-
-    # Fallback to officeAddress if placeOfPerformance is missing
-    if not pop or (isinstance(pop, dict) and not any(pop.values())):
-        pop = item.get("officeAddress")
-
-    # If still nothing, try alternative field names
-    if not pop or (isinstance(pop, dict) and not any(pop.values())):
-        pop = item.get("pointOfContact", {})
-
-    addr = pop or {}
+    # Use the first source with any location data: placeOfPerformance (most
+    # accurate for project location), then officeAddress, then pointOfContact
+    addr = None
+    for field_name in _LOCATION_SOURCE_FIELDS:
+        addr = item.get(field_name)
+        # SAM.gov might return placeOfPerformance as a string ("VA") instead of object
+        # If it's a string, it's just the state code - we need to get address from elsewhere
+        if field_name == "placeOfPerformance" and isinstance(addr, str):
+            logger.debug("placeOfPerformance is string: '%s' - trying officeAddress", addr)
+            continue
+        if addr and not (isinstance(addr, dict) and not any(addr.values())):
+            break
 
-    # Additional safety: if addr is a string, convert to empty dict
+    # Additional safety: if addr is a string (or missing), use an empty dict
     if not isinstance(addr, dict):
-        logger.debug(f"Address field is not a dict (type: {type(addr)}): {addr}")
-        addr = {}
-
-    city = None
-    state = None
-    zipcode = None
-    country = None
-
-    # Extract city - handle both dict and string formats
-    city_field = addr.get("city")
-    if isinstance(city_field, dict):
-        city = city_field.get("name") or city_field.get("code")
-    elif isinstance(city_field, str):
-        city = city_field.strip() if city_field.strip() else None
-
-    # Extract state - handle both dict and string formats
-    state_field = addr.get("state")
-    if isinstance(state_field, dict):
-        state = state_field.get("code") or state_field.get("name")
-    elif isinstance(state_field, str):
-        state = state_field.strip() if state_field.strip() else None
+        if addr:
+            logger.debug("Address field is not a dict (type: %s): %s", type(addr), addr)
+        addr = _EMPTY_LOCATION
+
+    city = _location_value(addr.get("city"), "name", "code")
+    state = _location_value(addr.get("state"), "code", "name")
 
     # Extract zipcode - try multiple field names
     zipcode = addr.get("zip") or addr.get("zipcode") or addr.get("zipCode")
     if zipcode and isinstance(zipcode, str):
         zipcode = zipcode.strip()
 
-    # Extract country - handle both dict and string formats
-    country_field = addr.get("country")
-    if isinstance(country_field, dict):
-        country = country_field.get("code") or country_field.get("name")
-    elif isinstance(country_field, str):
-        country = country_field.strip() if country_field.strip() else None
-
     # Fallback to countryCode field
-    if not country:
-        country = addr.get("countryCode")
+    country = _location_value(addr.get("country"), "code", "name") or addr.get("countryCode")
 
     return {
         "city": city,
@@ -237,7 +313,17 @@ def _get_geocoding_precision_level(loc: dict, address: str) -> str:
         return "unknown"
 
 
-def build_address_string(item: dict) -> Optional[str]:
+# Raw fields that sometimes hold a complete, formatted address string
+_ADDRESS_STRING_FIELDS = ("fullAddress", "full_address", "address", "locationString", "location_string")
+
+# A string looks like an address if it mentions the state, has a digit in
+# its last five characters (a ZIP), or contains a street-type word. These
+# are plain substring matches, so the shorter forms cover the longer ones
+# ("st" matches "street", "dr" matches "drive", ...)
+_ADDRESS_HINT_RE = re.compile(r"va|virginia|st|ave|road|rd|dr|lane|ln|\d(?=.{0,4}\Z)", re.IGNORECASE | re.DOTALL)
+
+
+def build_address_string(item: dict, location: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
     """
     Build a freeform address string from location fields for geocoding.
     ALWAYS tries to geocode if ANY location data is available (city, state, zipcode).
@@ -246,101 +332,142 @@ def build_address_string(item: dict) -> Optional[str]:
 
     Args:
         item: Raw SAM.gov opportunity dictionary
+        location: extract_location_fields(item), if the caller already has it
 
     Returns:
         Freeform address string or None (only if absolutely no location data)
     """
-    loc = extract_location_fields(item)
+    loc = location if location is not None else extract_location_fields(item)
 
     # Strategy 1: Check for full address strings in raw data FIRST (most specific)
     # Some SAM.gov records have formatted addresses in other fields
     # This might contain actual street addresses or more complete location info
     if isinstance(item, dict):
-        address_fields = [
-            item.get("fullAddress"),
-            item.get("full_address"),
-            item.get("address"),
-            item.get("locationString"),
-            item.get("location_string"),
-        ]
-        for addr_field in address_fields:
+        for field_name in _ADDRESS_STRING_FIELDS:
+            addr_field = item.get(field_name)
             if addr_field and isinstance(addr_field, str) and addr_field.strip():
                 addr_clean = addr_field.strip()
                 # If it looks like an address (contains state, zipcode, or street-like patterns), use it
-                addr_lower = addr_clean.lower()
-                has_state = any(state_code in addr_lower for state_code in ["va", "virginia", "va "])
-                has_zip = any(char.isdigit() for char in addr_clean[-5:])
-                has_street = any(word in addr_lower for word in ["street", "st", "avenue", "ave", "road", "rd", "drive", "dr", "lane", "ln"])
-                
-                if has_state or has_zip or has_street:
-                    logger.debug(f"Found full address string in raw data: '{addr_clean[:80]}'")
+                if _ADDRESS_HINT_RE.search(addr_clean):
+                    logger.debug("Found full address string in raw data: '%s'", addr_clean[:80])
                     return addr_clean
 
+    # Strategies 2-7 depend only on the location fields, which many items share
+    city, state, zipcode = loc.get("city"), loc.get("state"), loc.get("zipcode")
+    try:
+        address = _build_address_from_location(city, state, zipcode)
+    except TypeError:
+        # Unhashable field values (malformed payloads) can't use the cache
+        address = _build_address_from_location.__wrapped__(city, state, zipcode)
+
+    if address is None:
+        # Only return None if we have absolutely no location data
+        # This should be rare - most SAM.gov records have at least state information
+        logger.warning("No location data available for geocoding")
+    return address
+
+
+@lru_cache(maxsize=4096)
+def _build_address_from_location(city: Any, state: Any, zipcode: Any) -> Optional[str]:
+    """
+    Pick the most specific address string the location fields allow.
+    Memoized on (city, state, zipcode), so the strings are built once per
+    distinct location rather than once per item.
+    """
     # Strategy 2: City + State + ZIPCODE (most specific combination)
     # This will geocode to a specific area within the city (best for TravelTime API)
-    if loc.get("city") and loc.get("state") and loc.get("zipcode"):
-        address = f"{loc['city']}, {loc['state']} {loc['zipcode']}"
-        logger.debug(f"Geocoding with city+state+zip: '{address}'")
+    if city and state and zipcode:
+        address = f"{city}, {state} {zipcode}"
+        logger.debug("Geocoding with city+state+zip: '%s'", address)
         return address
 
     # Strategy 3: City + State (city-level coordinates - good for TravelTime API)
     # This will geocode to city center, which is acceptable for travel time calculations
-    if loc.get("city") and loc.get("state"):
-        address = f"{loc['city']}, {loc['state']}"
-        logger.debug(f"Geocoding with city+state: '{address}' (city-level coordinates)")
+    if city and state:
+        address = f"{city}, {state}"
+        logger.debug("Geocoding with city+state: '%s' (city-level coordinates)", address)
         return address
 
     # Strategy 4: City alone (if we have city but no state, still try to geocode)
     # Google can often geocode city names, especially well-known cities
-    if loc.get("city"):
-        city = str(loc["city"]).strip()
-        logger.debug(f"Geocoding city only: '{city}' (no state available)")
-        return city
+    if city:
+        city_only = str(city).strip()
+        logger.debug("Geocoding city only: '%s' (no state available)", city_only)
+        return city_only
 
     # Strategy 5: State + ZIPCODE (zipcode-level coordinates)
     # ZIP codes can be geocoded to a general area
-    if loc.get("zipcode") and loc.get("state"):
-        address = f"{loc['state']} {loc['zipcode']}"
-        logger.debug(f"Geocoding with state+zip: '{address}' (zipcode-level coordinates)")
+    if zipcode and state:
+        address = f"{state} {zipcode}"
+        logger.debug("Geocoding with state+zip: '%s' (zipcode-level coordinates)", address)
         return address
 
     # Strategy 6: State only (state-level coordinates - least specific but still usable)
     # This will geocode to state center, which is acceptable for TravelTime API
     # Better than nothing - at least provides coordinates
-    if loc.get("state"):
-        state = str(loc["state"]).strip()
-        address = f"{state}, USA"
-        logger.debug(f"Geocoding state only: '{address}' (state-level coordinates - less precise but usable)")
+    if state:
+        address = f"{str(state).strip()}, USA"
+        logger.debug("Geocoding state only: '%s' (state-level coordinates - less precise but usable)", address)
         return address
 
     # Strategy 7: ZIPCODE alone (if we somehow have zipcode but no state)
-    if loc.get("zipcode"):
-        zipcode = str(loc["zipcode"]).strip()
-        logger.debug(f"Geocoding zipcode only: '{zipcode}' (no state available)")
-        return zipcode
-
-    # Only return None if we have absolutely no location data
-    # This should be rare - most SAM.gov records have at least state information
-    logger.warning("No location data available for geocoding")
+    if zipcode:
+        zipcode_only = str(zipcode).strip()
+        logger.debug("Geocoding zipcode only: '%s' (no state available)", zipcode_only)
+        return zipcode_only
+
     return None
 
 
-def normalize_sam_opportunity(item: dict) -> dict:
+def _intern(value: Any) -> Any:
+    """
+    Intern short, heavily repeated string fields (state, country, NAICS,
+    notice type) so cached projects share one copy of each value.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _log_location_details(item: dict, location: Dict[str, Optional[str]]) -> None:
+    """
+    Log the location data of an item that couldn't be placed on the map.
+    Formatting is left to logging, so the raw payloads are only stringified
+    (and truncated) if the record is actually emitted.
+    """
+    logger.error("  Location fields: %s", location)
+    logger.error("  Raw placeOfPerformance: %.200s", item.get("placeOfPerformance"))
+    logger.error("  Raw officeAddress: %.200s", item.get("officeAddress"))
+
+
+def normalize_sam_opportunity(
+    item: dict,
+    geocoded: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    location: Optional[Dict[str, Optional[str]]] = None,
+    sam_coordinates: Optional[Tuple[float, float]] = _UNSET,
+    address: Optional[str] = _UNSET,
+) -> dict:
     """
     Convert a raw SAM.gov opportunity dict into a simplified, business-facing structure.
 
     Args:
         item: Raw SAM.gov opportunity dictionary
+        geocoded: Optional address -> (lat, lng) results already looked up for
+            this batch; addresses missing from it are geocoded here
+        location: extract_location_fields(item), if the caller already has it
+        sam_coordinates: extract_coordinates_from_item(item), if the caller
+            already has it
+        address: build_address_string(item, location), if the caller already has it
 
     Returns:
         Normalized project dictionary with business-focused fields
     """
     try:
-        location = extract_location_fields(item)
-        address = build_address_string(item)
+        if location is None:
+            location = extract_location_fields(item)
+        if address is _UNSET:
+            address = build_address_string(item, location)
     except Exception as e:
-        logger.error(f"Error extracting location from SAM item: {e}")
-        logger.error(f"Item keys: {list(item.keys()) if isinstance(item, dict) else 'NOT A DICT'}")
+        logger.error("Error extracting location from SAM item: %s", e)
+        logger.error("Item keys: %s", list(item.keys()) if isinstance(item, dict) else 'NOT A DICT')
         # Return minimal data with no coordinates
         return {
             "id": item.get("noticeId"),
@@ -366,72 +493,71 @@ def normalize_sam_opportunity(item: dict) -> dict:
     lat = None
     lng = None
     notice_id = item.get('noticeId', 'UNKNOWN')
-    title = item.get('title', 'N/A')[:50]
 
-    sam_coordinates = extract_coordinates_from_item(item)
+    if sam_coordinates is _UNSET:
+        sam_coordinates = extract_coordinates_from_item(item)
     if sam_coordinates:
         lat_candidate, lng_candidate = sam_coordinates
         if lat_candidate is not None and lng_candidate is not None:
             lat = float(lat_candidate)
             lng = float(lng_candidate)
             coordinates_source = "sam"
-            logger.info(f"[{notice_id}] Using SAM-provided coordinates ({lat:.4f}, {lng:.4f})")
+            logger.info("[%s] Using SAM-provided coordinates (%.4f, %.4f)", notice_id, lat, lng)
 
     if address:
         if coordinates_source == "sam":
-            logger.debug(f"[{notice_id}] Skipping geocode lookup (coordinates already provided by SAM.gov)")
+            logger.debug("[%s] Skipping geocode lookup (coordinates already provided by SAM.gov)", notice_id)
         else:
-            precision_level = _get_geocoding_precision_level(location, address)
-            logger.info(f"[{notice_id}] Geocoding: '{address}' (precision: {precision_level})")
-            lat_candidate, lng_candidate = geocode_address(address)
+            # The precision label is only used in log messages
+            precision_level = (
+                _get_geocoding_precision_level(location, address)
+                if logger.isEnabledFor(logging.INFO) else None
+            )
+            logger.info("[%s] Geocoding: '%s' (precision: %s)", notice_id, address, precision_level)
+            if geocoded is not None and address in geocoded:
+                lat_candidate, lng_candidate = geocoded[address]
+            else:
+                lat_candidate, lng_candidate = geocode_address(address)
             if lat_candidate and lng_candidate:
                 lat = lat_candidate
                 lng = lng_candidate
                 coordinates_source = "geocoded"
-                logger.info(f"[{notice_id}] Geocode success: ({lat:.4f}, {lng:.4f}) [precision: {precision_level}]")
+                logger.info("[%s] Geocode success: (%.4f, %.4f) [precision: %s]", notice_id, lat, lng, precision_level)
             else:
-                logger.error(f"[{notice_id}] GEOCODE FAILED")
-                logger.error(f"  Title: {title}")
-                logger.error(f"  Address: {address}")
-                logger.error(f"  Location fields: {location}")
-                # Safely log raw data with str() to prevent encoding issues
-                try:
-                    logger.error(f"  Raw placeOfPerformance: {str(item.get('placeOfPerformance'))[:200]}")
-                    logger.error(f"  Raw officeAddress: {str(item.get('officeAddress'))[:200]}")
-                except Exception:
-                    logger.error("  (Could not log raw location data)")
+                logger.error("[%s] GEOCODE FAILED", notice_id)
+                logger.error("  Title: %.50s", item.get('title', 'N/A'))
+                logger.error("  Address: %s", address)
+                _log_location_details(item, location)
     else:
         if coordinates_source == "none":
-            logger.error(f"[{notice_id}] NO ADDRESS - Cannot geocode")
-            logger.error(f"  Title: {title}")
-            logger.error(f"  Location fields: {location}")
-            # Safely log raw data
-            try:
-                logger.error(f"  Raw placeOfPerformance: {str(item.get('placeOfPerformance'))[:200]}")
-                logger.error(f"  Raw officeAddress: {str(item.get('officeAddress'))[:200]}")
-            except Exception:
-                logger.error("  (Could not log raw location data)")
+            logger.error("[%s] NO ADDRESS - Cannot geocode", notice_id)
+            logger.error("  Title: %.50s", item.get('title', 'N/A'))
+            _log_location_details(item, location)
     
-    # award.amount may be missing or a string; try to convert to float
+    # award.amount may be missing, a number, or a string like "$1,250,000.00"
     award_info = item.get("award") or {}
     amount_raw = award_info.get("amount")
-    try:
-        estimated_award_amount = float(amount_raw.replace(",", "")) if amount_raw is not None else None
-    except Exception:
-        estimated_award_amount = None
+    estimated_award_amount = None
+    if isinstance(amount_raw, (int, float)):
+        estimated_award_amount = float(amount_raw)
+    elif isinstance(amount_raw, str):
+        try:
+            estimated_award_amount = float(_AMOUNT_NOISE_RE.sub("", amount_raw))
+        except ValueError:
+            pass
     
     return {
         "id": item.get("noticeId"),
         "title": item.get("title"),
         "posted_date": item.get("postedDate"),
         "response_deadline": item.get("responseDeadLine"),
-        "naics": item.get("naicsCode"),
-        "project_type": item.get("type"),  # e.g. "Award Notice"
+        "naics": _intern(item.get("naicsCode")),
+        "project_type": _intern(item.get("type")),  # e.g. "Award Notice"
         "department": item.get("department") or item.get("fullParentPathName"),
         "city": location.get("city"),
-        "state": location.get("state"),
+        "state": _intern(location.get("state")),
         "zipcode": location.get("zipcode"),
-        "country": location.get("country"),
+        "country": _intern(location.get("country")),
         "address": address,
         "lat": lat,
         "lng": lng,
@@ -471,12 +597,12 @@ def fetch_live_projects(
         raise RuntimeError("SAM_API_KEY is not configured; cannot call SAM.gov live.")
     
     # Create cache key from parameters (exclude API key for security)
-    cache_key = f"{keyword}_{naics_code}_{posted_from}_{posted_to}_{limit}_{ptype}"
+    cache_key = _projects_cache_key(posted_from, posted_to, limit, keyword, naics_code, ptype)
     
     # Check cache first
     cached_result = _get_cached_response(cache_key)
     if cached_result is not None:
-        logger.info(f"Returning {len(cached_result)} cached SAM.gov projects")
+        logger.info("Returning %d cached SAM.gov projects", len(cached_result))
         return cached_result
     
     # Throttle requests to avoid hitting rate limits
@@ -496,7 +622,7 @@ def fetch_live_projects(
         # Ensure it's properly formatted (strip whitespace)
         naics_clean = str(naics_code).strip()
         params["naicsCode"] = naics_clean
-        logger.debug(f"Adding NAICS code filter: {naics_clean}")
+        logger.debug("Adding NAICS code filter: %s", naics_clean)
     if ptype:
         params["ptype"] = ptype  # e.g., "a" for Award Notice
     
@@ -505,23 +631,23 @@ def fetch_live_projects(
     # Attempting to add placeOfPerformance.stateCode causes 500 errors
     # State filtering happens after receiving results (lines 465-473)
     if STATE_FILTER:
-        logger.debug(f"State filter '{STATE_FILTER}' will be applied via post-processing after API response")
+        logger.debug("State filter '%s' will be applied via post-processing after API response", STATE_FILTER)
     
     logger.info("Calling SAM.gov with params: %s", params)
     
     try:
-        resp = requests.get(SAM_BASE_URL, params=params, timeout=20)
+        resp = _SESSION.get(SAM_BASE_URL, params=params, timeout=20)
         
         # Check rate limit headers if available
         rate_limit_remaining = resp.headers.get('X-RateLimit-Remaining')
         rate_limit_reset = resp.headers.get('X-RateLimit-Reset')
         if rate_limit_remaining:
-            logger.debug(f"SAM.gov rate limit remaining: {rate_limit_remaining}")
+            logger.debug("SAM.gov rate limit remaining: %s", rate_limit_remaining)
             if rate_limit_remaining == '0':
-                logger.warning(f"Rate limit reached. Resets at: {rate_limit_reset}")
+                logger.warning("Rate limit reached. Resets at: %s", rate_limit_reset)
         
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except requests.exceptions.HTTPError as e:
         status_code = e.response.status_code if e.response else None
         # Check if the error message contains rate limiting info
@@ -543,7 +669,7 @@ def fetch_live_projects(
         if is_rate_limit:
             logger.error("SAM.gov API rate limit exceeded (429)")
             logger.error("You've made too many requests. Please wait a few minutes and try again.")
-            logger.error(f"Response details: {response_text[:500]}")
+            logger.error("Response details: %s", response_text[:500])
             raise RuntimeError("SAM.gov API rate limit exceeded. Please wait a few minutes and try again.") from e
         elif status_code == 500:
             # Check if 500 error is actually a rate limit error in disguise
@@ -551,23 +677,23 @@ def fetch_live_projects(
             error_combined = (response_text + " " + error_text).lower()
             if "429" in error_combined or "too many requests" in error_combined or "rate limit" in error_combined:
                 logger.error("SAM.gov API returned 500 but appears to be rate limit issue")
-                logger.error(f"Error text: {error_text[:200]}")
-                logger.error(f"Response: {response_text[:500]}")
+                logger.error("Error text: %s", error_text[:200])
+                logger.error("Response: %s", response_text[:500])
                 raise RuntimeError("SAM.gov API rate limit exceeded (detected in 500 response). Please wait a few minutes and try again.") from e
             
             # 500 errors often indicate invalid parameters
-            logger.error(f"SAM.gov API returned 500 Internal Server Error")
-            logger.error(f"Request parameters: {params}")
-            logger.error(f"This may indicate invalid parameter names or values")
-            logger.error(f"Response: {response_text[:500]}")
+            logger.error("SAM.gov API returned 500 Internal Server Error")
+            logger.error("Request parameters: %s", params)
+            logger.error("This may indicate invalid parameter names or values")
+            logger.error("Response: %s", response_text[:500])
             raise RuntimeError(
                 f"SAM.gov API returned 500 error. This may indicate invalid parameters. "
                 f"Check that NAICS code '{naics_code if naics_code else 'N/A'}' is valid and properly formatted."
             ) from e
         else:
-            logger.error(f"HTTP error calling SAM.gov API: {status_code} - {e}")
+            logger.error("HTTP error calling SAM.gov API: %s - %s", status_code, e)
             if e.response:
-                logger.error(f"Response text: {e.response.text[:500]}")
+                logger.error("Response text: %s", e.response.text[:500])
             raise
     except requests.exceptions.RequestException as e:
         logger.error("Network error calling SAM.gov API: %s", e)
@@ -579,25 +705,25 @@ def fetch_live_projects(
     raw_items = data.get("opportunitiesData", []) or []
 
     # DEBUG: Log structure of first item to understand SAM.gov format
-    if raw_items and len(raw_items) > 0:
+    if raw_items and logger.isEnabledFor(logging.DEBUG):
         first_item = raw_items[0]
         logger.debug("=" * 60)
         logger.debug("SAMPLE SAM.GOV ITEM STRUCTURE (first result):")
-        logger.debug(f"  Keys: {list(first_item.keys())}")
+        logger.debug("  Keys: %s", list(first_item.keys()))
         if "placeOfPerformance" in first_item:
             pop = first_item.get("placeOfPerformance")
-            logger.debug(f"  placeOfPerformance type: {type(pop)}")
+            logger.debug("  placeOfPerformance type: %s", type(pop))
             if isinstance(pop, dict):
-                logger.debug(f"  placeOfPerformance keys: {list(pop.keys())}")
-                logger.debug(f"  placeOfPerformance content: {pop}")
+                logger.debug("  placeOfPerformance keys: %s", list(pop.keys()))
+                logger.debug("  placeOfPerformance content: %s", pop)
         if "officeAddress" in first_item:
             addr = first_item.get("officeAddress")
-            logger.debug(f"  officeAddress type: {type(addr)}")
+            logger.debug("  officeAddress type: %s", type(addr))
             if isinstance(addr, dict):
-                logger.debug(f"  officeAddress keys: {list(addr.keys())}")
+                logger.debug("  officeAddress keys: %s", list(addr.keys()))
         logger.debug("=" * 60)
 
-    projects = []
+    accepted_items = []
     filtered_counts = {
         "inactive": 0,
         "non_usa": 0,
@@ -607,59 +733,156 @@ def fetch_live_projects(
 
     for item in raw_items:
         try:
-            # Only keep active records in the USA
-            if item.get("active") != "Yes":
-                filtered_counts["inactive"] += 1
+            rejection, loc = _screen_item(item)
+            if rejection:
+                filtered_counts[rejection] += 1
                 continue
 
-            loc = extract_location_fields(item)
-            if loc.get("country") not in (None, "USA"):
-                filtered_counts["non_usa"] += 1
-                continue
-
-            # Filter by Virginia state if state is available
-            # Handle variations: VA, Virginia, va, virginia
-            state = loc.get("state")
-            if state:
-                state_upper = str(state).upper().strip()
-                # Accept "VA" or "VIRGINIA"
-                if state_upper not in ("VA", "VIRGINIA"):
-                    filtered_counts["wrong_state"] += 1
-                    continue
-
-            # No longer filtering by NAICS codes - keyword search is handled by SAM.gov API "Keyword Search" parameter
-            normalized = normalize_sam_opportunity(item)
-            projects.append(normalized)
+            # Keep the extracted location, coordinates and address so later
+            # passes don't redo them
+            accepted_items.append((item, loc, *_prepare_item(item, loc)))
             filtered_counts["accepted"] += 1
         except Exception as e:
             # If processing a single item fails, log it but continue with other items
             notice_id = item.get("noticeId", "UNKNOWN")
-            logger.error(f"Error processing SAM.gov item {notice_id}: {e}")
-            logger.debug(f"  Item keys: {list(item.keys()) if isinstance(item, dict) else 'NOT A DICT'}")
+            logger.error("Error processing SAM.gov item %s: %s", notice_id, e)
+            logger.debug("  Item keys: %s", list(item.keys()) if isinstance(item, dict) else 'NOT A DICT')
             # Continue processing other items instead of crashing
             continue
 
-    logger.info(f"SAM.gov filtering results: {len(raw_items)} total → {filtered_counts['accepted']} accepted")
-    logger.info(f"  Filtered out: {filtered_counts['inactive']} inactive, {filtered_counts['non_usa']} non-USA, {filtered_counts['wrong_state']} wrong state")
+    # Many items share the same city/state/ZIP, so geocode each distinct
+    # address once (in parallel) before normalizing
+    geocoded = _geocode_batch_addresses(accepted_items)
+
+    projects = []
+    for item, loc, sam_coordinates, address in accepted_items:
+        try:
+            projects.append(normalize_sam_opportunity(item, geocoded, loc, sam_coordinates, address))
+        except Exception as e:
+            notice_id = item.get("noticeId", "UNKNOWN")
+            logger.error("Error processing SAM.gov item %s: %s", notice_id, e)
+            continue
+
+    logger.info("SAM.gov filtering results: %d total → %s accepted", len(raw_items), filtered_counts['accepted'])
+    logger.info("  Filtered out: %s inactive, %s non-USA, %s wrong state", filtered_counts['inactive'], filtered_counts['non_usa'], filtered_counts['wrong_state'])
 
     # Count how many have valid coordinates
     with_coords = sum(1 for p in projects if p.get("lat") and p.get("lng"))
     without_coords = len(projects) - with_coords
-    logger.info(f"  Geocoding results: {with_coords} with coordinates, {without_coords} without coordinates")
+    logger.info("  Geocoding results: %s with coordinates, %s without coordinates", with_coords, without_coords)
     if projects:
         source_counts = Counter(p.get("coordinates_source", "unknown") for p in projects)
         logger.info("  Coordinate sources: %s", ", ".join(f"{src}: {cnt}" for src, cnt in source_counts.items()))
 
     if without_coords > 0:
-        logger.warning(f"  ⚠ {without_coords} projects will NOT appear on map (missing coordinates)")
+        logger.warning("  ⚠ %s projects will NOT appear on map (missing coordinates)", without_coords)
 
     # Cache the result before returning
     _set_cached_response(cache_key, projects)
-    logger.info(f"Cached {len(projects)} SAM.gov projects for future requests")
+    logger.info("Cached %d SAM.gov projects for future requests", len(projects))
 
     return projects
 
 
+def _screen_item(item: dict) -> Tuple[Optional[str], Optional[Dict[str, Optional[str]]]]:
+    """
+    Apply the active / USA / Virginia filters to a raw SAM.gov item.
+    NAICS isn't filtered here - keyword search is handled by the SAM.gov
+    "Keyword Search" parameter.
+    
+    Returns:
+        (rejection, location) - rejection is the filtered_counts key the item
+        was rejected under, or None if accepted; location is the item's
+        extract_location_fields result when it was computed
+    """
+    # Only keep active records in the USA
+    if item.get("active") != "Yes":
+        return "inactive", None
+
+    loc = extract_location_fields(item)
+    if loc["country"] not in (None, "USA"):
+        return "non_usa", loc
+
+    # Filter by Virginia state if state is available
+    # Handle variations: VA, Virginia, va, virginia
+    state = loc["state"]
+    if state and str(state).upper().strip() not in _VIRGINIA_STATE_NAMES:
+        return "wrong_state", loc
+
+    return None, loc
+
+
+def _prepare_item(item: dict, loc: Dict[str, Optional[str]]) -> Tuple[Any, Any]:
+    """
+    Extract an accepted item's SAM-provided coordinates and build its
+    geocoding address, once, for both the batch geocode and normalization.
+    
+    Returns:
+        (sam_coordinates, address), or (_UNSET, _UNSET) if extraction failed so
+        normalize_sam_opportunity redoes it and reports the error
+    """
+    try:
+        return extract_coordinates_from_item(item), build_address_string(item, loc)
+    except Exception:
+        return _UNSET, _UNSET
+
+
+def _geocode_batch_addresses(
+    items: List[Tuple[dict, Dict[str, Optional[str]], Any, Any]],
+) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """
+    Geocode the distinct addresses of the items that SAM.gov didn't give
+    coordinates for, once each, with bounded parallelism.
+    
+    Args:
+        items: (raw item, location fields, sam_coordinates, address) tuples,
+            as built with _prepare_item
+    
+    Returns:
+        Dictionary mapping each address string to its (lat, lng)
+    """
+    unique_addresses = {}
+    for _item, _loc, sam_coordinates, address in items:
+        # Items that failed extraction (_UNSET) are left to normalize_sam_opportunity
+        if sam_coordinates is not _UNSET and not sam_coordinates and address:
+            unique_addresses[address] = None
+    
+    if not unique_addresses:
+        return {}
+    
+    addresses = list(unique_addresses)
+    logger.info("Geocoding %d unique addresses for %d SAM.gov items", len(addresses), len(items))
+    if len(addresses) == 1 or SAM_GEOCODE_PARALLELISM == 1:
+        # Not worth starting a pool
+        return {address: geocode_address(address) for address in addresses}
+    # geocode_client's pooled session is shared safely across the workers
+    with ThreadPoolExecutor(max_workers=min(SAM_GEOCODE_PARALLELISM, len(addresses))) as pool:
+        return dict(zip(addresses, pool.map(geocode_address, addresses)))
+
+
+def get_stale_live_projects(
+    posted_from: date,
+    posted_to: date,
+    limit: int = 50,
+    keyword: Optional[str] = None,
+    naics_code: Optional[str] = None,
+    ptype: Optional[str] = None,
+) -> Optional[List[dict]]:
+    """
+    Return the last successful fetch_live_projects result for these parameters,
+    even if it has expired, as long as it is younger than the stale TTL (24h).
+    Meant as a fallback when a live call fails.
+    
+    Args:
+        Same as fetch_live_projects
+        
+    Returns:
+        List of normalized project dictionaries, or None if nothing usable is cached
+    """
+    cache_key = _projects_cache_key(posted_from, posted_to, limit, keyword, naics_code, ptype)
+    return _get_cached_response(cache_key, max_age=_stale_cache_ttl)
+
+
 def fetch_projects(mock: bool = False) -> List[Dict]:
     """
     Fetch SAM.gov opportunities (backward compatibility wrapper).
@@ -693,26 +916,38 @@ def fetch_projects(mock: bool = False) -> List[Dict]:
         return _load_mock_data()
 
 
+_MOCK_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_sam.json")
+
+
 def _load_mock_data() -> List[Dict]:
     """
     Load mock SAM.gov data from sample_sam.json.
     All mock data should be in Virginia and match required NAICS codes.
     """
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(script_dir, "sample_sam.json")
-        
-        if not os.path.exists(json_path):
-            logger.warning("sample_sam.json not found, returning empty list")
-            return []
-        
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        mtime_ns = os.stat(_MOCK_DATA_PATH).st_mtime_ns
+    except OSError:
+        logger.warning("sample_sam.json not found, returning empty list")
+        return []
+    # Copy so callers can't mutate the cached projects
+    return [dict(project) for project in _read_mock_data(mtime_ns)]
+
+
+@lru_cache(maxsize=1)
+def _read_mock_data(mtime_ns: int) -> Tuple[Dict, ...]:
+    """
+    Parse and filter sample_sam.json.
+    Cached per file modification time, so mock requests don't re-read and
+    re-filter the file every time, yet edits to it still show up.
+    """
+    try:
+        with open(_MOCK_DATA_PATH, "rb") as f:
+            data = orjson.loads(f.read())
         
         # Validate mock data structure
         if not isinstance(data, list):
             logger.error("sample_sam.json should contain a list of projects")
-            return []
+            return ()
         
         # Filter to ensure all entries match our NAICS codes
         filtered_data = []
@@ -722,22 +957,27 @@ def _load_mock_data() -> List[Dict]:
                 lat = project.get("lat")
                 lng = project.get("lng")
                 if lat and lng and _is_virginia_location(lat, lng):
-                    project = project.copy()
-                    project.setdefault("coordinates_source", project.get("coordinates_source", "mock"))
+                    project.setdefault("coordinates_source", "mock")
                     filtered_data.append(project)
         
-        logger.info(f"Loaded {len(filtered_data)} mock SAM.gov projects (filtered by NAICS and Virginia)")
-        return filtered_data
+        logger.info("Loaded %d mock SAM.gov projects (filtered by NAICS and Virginia)", len(filtered_data))
+        return tuple(filtered_data)
         
     except FileNotFoundError:
         logger.warning("sample_sam.json not found, returning empty list")
-        return []
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing sample_sam.json: {e}")
-        return []
+        return ()
+    except orjson.JSONDecodeError as e:
+        logger.error("Error parsing sample_sam.json: %s", e)
+        return ()
     except Exception as e:
-        logger.error(f"Error loading mock data: {e}")
-        return []
+        logger.error("Error loading mock data: %s", e)
+        return ()
+
+
+# Virginia approximate boundaries
+# More precise bounds: 36.5407° N to 39.4660° N, 83.6754° W to 75.2423° W
+_VA_LAT_MIN, _VA_LAT_MAX = 36.5, 39.5
+_VA_LNG_MIN, _VA_LNG_MAX = -83.5, -75.0
 
 
 def _is_virginia_location(lat: float, lng: float) -> bool:
@@ -754,10 +994,5 @@ def _is_virginia_location(lat: float, lng: float) -> bool:
     except (ValueError, TypeError):
         return False
     
-    # Virginia approximate boundaries
-    # More precise bounds: 36.5407° N to 39.4660° N, 83.6754° W to 75.2423° W
-    va_lat_min, va_lat_max = 36.5, 39.5
-    va_lng_min, va_lng_max = -83.5, -75.0
-    
-    return (va_lat_min <= lat <= va_lat_max and 
-            va_lng_min <= lng <= va_lng_max)
+    return (_VA_LAT_MIN <= lat <= _VA_LAT_MAX and
+            _VA_LNG_MIN <= lng <= _VA_LNG_MAX)
@@ -0,0 +1,25 @@
+"""
+Shared test fixtures.
+Puts the backend on the import path and builds the app client once.
+"""
+import sys
+import os
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "backend"))
+
+# Never read or create the on-disk geocode cache from tests
+os.environ["GEOCODE_CACHE_PATH"] = ""
+
+from main import app
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP client that calls the FastAPI app in-process"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,68 @@
+"""
+Test the geocode caches. Google is never called: the lookup is replaced.
+"""
+import sqlite3
+
+import pytest
+
+import geocode_client
+
+
+@pytest.fixture
+def disk_cache(monkeypatch, tmp_path):
+    """Point geocode_client at a fresh on-disk cache and empty in-memory caches"""
+    path = tmp_path / "geocode.sqlite3"
+    monkeypatch.setattr(geocode_client, "GOOGLE_MAPS_API_KEY", "test-key")
+    monkeypatch.setattr(geocode_client, "GEOCODE_CACHE_PATH", str(path))
+    monkeypatch.setattr(geocode_client, "_DISK_CACHE", None)
+    monkeypatch.setattr(geocode_client, "_DISK_CACHE_OPENED", False)
+    monkeypatch.setattr(geocode_client, "_negative_cache", {})
+    geocode_client._geocode_cached.cache_clear()
+    yield path
+    if geocode_client._DISK_CACHE is not None:
+        geocode_client._DISK_CACHE.close()
+    geocode_client._geocode_cached.cache_clear()
+
+
+def _cached_addresses(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT addr FROM geo")]
+    finally:
+        conn.close()
+
+
+def test_failed_geocode_is_not_persisted(disk_cache, monkeypatch):
+    """Test that a failed lookup is cached neither in memory nor on disk"""
+    calls = []
+
+    def lookup(address):
+        calls.append(address)
+        return None, None
+
+    monkeypatch.setattr(geocode_client, "_call_google_geocode", lookup)
+
+    assert geocode_client.geocode_address("Nowhere, VA") == (None, None)
+    assert geocode_client.geocode_address("Nowhere, VA") == (None, None)
+
+    assert calls == ["nowhere, va", "nowhere, va"]
+    assert _cached_addresses(disk_cache) == []
+
+
+def test_successful_geocode_is_persisted(disk_cache, monkeypatch):
+    """Test that a successful lookup is written to disk and served from there after a restart"""
+    calls = []
+
+    def lookup(address):
+        calls.append(address)
+        return 37.5407, -77.4360
+
+    monkeypatch.setattr(geocode_client, "_call_google_geocode", lookup)
+
+    assert geocode_client.geocode_address("Richmond, VA") == (37.5407, -77.4360)
+    assert _cached_addresses(disk_cache) == ["richmond, va"]
+
+    # Simulate a restart: the in-memory cache is gone, the disk cache isn't
+    geocode_client._geocode_cached.cache_clear()
+    assert geocode_client.geocode_address("Richmond, VA") == (37.5407, -77.4360)
+    assert calls == ["richmond, va"]
@@ -0,0 +1,155 @@
+"""
+Test the isochrone cache, request sharing and polygon simplification.
+TravelTime is never called: the upstream fetch is replaced with mock polygons.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+
+import iso_client
+
+LAT, LNG = 37.5407, -77.4360
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    Give iso_client credentials and empty caches, and replace the TravelTime
+    fetch with one that records each call. Returns (calls, gate): set gate
+    to let blocked fetches finish.
+    """
+    monkeypatch.setattr(iso_client, "TRAVELTIME_API_KEY", "test-key")
+    monkeypatch.setattr(iso_client, "TRAVELTIME_APP_ID", "test-app")
+    monkeypatch.setattr(iso_client, "_isochrone_cache", OrderedDict())
+    monkeypatch.setattr(iso_client, "_inflight", {})
+    monkeypatch.setattr(iso_client, "_refreshing", set())
+
+    calls = []
+    gate = threading.Event()
+    gate.set()
+
+    def fetch(lat, lng, minutes_tiers):
+        calls.append((lat, lng, tuple(minutes_tiers)))
+        gate.wait(timeout=5)
+        features = {}
+        for minutes in minutes_tiers:
+            features[minutes] = iso_client._get_mock_polygon(lat, lng, minutes)
+            iso_client._isochrone_cache_put(iso_client._isochrone_cache_key(lat, lng, minutes), features[minutes])
+        return features
+
+    monkeypatch.setattr(iso_client, "_fetch_isochrones", fetch)
+    return calls, gate
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_stale_entry_refreshes_once(upstream, monkeypatch):
+    """Test that repeated hits on a stale entry are served immediately and queue one refresh"""
+    calls, gate = upstream
+    stale = iso_client._get_mock_polygon(LAT, LNG, 30)
+    key = iso_client._isochrone_cache_key(LAT, LNG, 30)
+    iso_client._isochrone_cache[key] = (time.time() - iso_client.ISOCHRONE_CACHE_TTL - 1, stale)
+
+    refreshes = []
+    refresh = iso_client._refresh_isochrones
+    monkeypatch.setattr(
+        iso_client, "_refresh_isochrones",
+        lambda *args: (refreshes.append(args), refresh(*args)),
+    )
+
+    gate.clear()
+    for _ in range(5):
+        assert iso_client.get_isochrone(LAT, LNG, 30) == stale
+    gate.set()
+    _wait_for(lambda: not iso_client._refreshing)
+
+    assert len(refreshes) == 1
+    assert len(calls) == 1
+    fetched_at, _ = iso_client._isochrone_cache[key]
+    assert time.time() - fetched_at < iso_client.ISOCHRONE_CACHE_TTL
+
+
+def test_concurrent_callers_share_one_request(upstream):
+    """Test that concurrent callers for the same isochrone make one upstream call"""
+    calls, gate = upstream
+    gate.clear()
+    results = []
+
+    def call():
+        results.append(iso_client.get_isochrone(LAT, LNG, 45))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: calls)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(result == results[0] for result in results)
+    # Each caller gets its own copy of the cached feature
+    assert len({id(result) for result in results}) == 8
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_each_location_once(upstream):
+    """Test that a batch makes one upstream call per distinct center, covering all its travel times"""
+    calls, _ = upstream
+    other = (36.8468, -76.2852)
+    queries = [(LAT, LNG, 30), (LAT, LNG, 45), (*other, 30), (LAT, LNG, 30)]
+
+    features = await iso_client.get_isochrones_batch(queries)
+
+    assert sorted(calls) == sorted([(LAT, LNG, (30, 45)), (*other, (30,))])
+    assert [f["properties"]["minutes"] for f in features] == [30, 45, 30, 30]
+    assert features[0] == features[3] and features[0] is not features[3]
+
+
+def test_simplified_ring_stays_closed():
+    """Test that Ramer-Douglas-Peucker simplification keeps a closed ring closed"""
+    n = 500
+    ring = [
+        [LNG + 0.3 * math.cos(2 * math.pi * i / n), LAT + 0.2 * math.sin(2 * math.pi * i / n)]
+        for i in range(n)
+    ]
+    ring.append(list(ring[0]))
+
+    simplified = iso_client._simplify_ring(ring, iso_client.ISOCHRONE_SIMPLIFY_TOLERANCE)
+
+    assert simplified[0] == simplified[-1] == ring[0]
+    assert 4 <= len(simplified) < len(ring)
+
+
+def test_containment_checked_against_simplified_ring():
+    """Test that the center check describes the simplified ring, not the raw one"""
+    # A square ring whose south edge bulges out by less than the tolerance;
+    # the center sits inside the bulge, so simplification leaves it outside
+    west, east, south, north = LNG - 0.1, LNG + 0.1, LAT, LAT + 0.2
+    tolerance = iso_client.ISOCHRONE_SIMPLIFY_TOLERANCE
+    steps = 40
+    shell = [(west + (east - west) * i / steps, south) for i in range(steps // 2)]
+    shell.append((LNG, south - tolerance / 2))
+    shell += [(west + (east - west) * i / steps, south) for i in range(steps // 2 + 1, steps)]
+    shell += [(east, south + (north - south) * i / steps) for i in range(steps)]
+    shell += [(east - (east - west) * i / steps, north) for i in range(steps)]
+    shell += [(west, north - (north - south) * i / steps) for i in range(steps)]
+    result = {"shapes": [{"shell": [{"lat": y, "lng": x} for x, y in shell]}]}
+    center_lat = south - tolerance / 4
+
+    raw = iso_client._build_feature_from_result(result, center_lat, LNG, 30, simplify_tolerance=0)
+    simplified = iso_client._build_feature_from_result(result, center_lat, LNG, 30, simplify_tolerance=tolerance)
+
+    assert len(simplified["geometry"]["coordinates"][0]) < len(raw["geometry"]["coordinates"][0])
+    assert not any("does not contain the marker" in w for w in raw["properties"]["warnings"])
+    assert any("does not contain the marker" in w for w in simplified["properties"]["warnings"])
+    assert any("bounding box" in w or "enclose" in w for w in simplified["properties"]["warnings"])
@@ -0,0 +1,38 @@
+"""
+Test batch places endpoint with mock data.
+"""
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_places_batch_mock(client):
+    """Test that batch places endpoint returns one result list per query, in order"""
+    response = await client.post(
+        "/api/places/batch?mock=true",
+        json={"queries": ["Vulcan", "Cemex", "Vulcan"]}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert isinstance(data, list)
+    assert [entry["query"] for entry in data] == ["Vulcan", "Cemex", "Vulcan"]
+    
+    for entry in data:
+        assert isinstance(entry["results"], list)
+        assert len(entry["results"]) > 0
+        for place in entry["results"]:
+            assert entry["query"].lower() in place["name"].lower()
+            assert isinstance(place["lat"], (int, float))
+            assert isinstance(place["lng"], (int, float))
+
+
+@pytest.mark.asyncio
+async def test_places_batch_rejects_oversized_batch(client):
+    """Test that a batch above the query cap is rejected before any search runs"""
+    response = await client.post(
+        "/api/places/batch?mock=true",
+        json={"queries": [f"Vulcan {i}" for i in range(21)]}
+    )
+    
+    assert response.status_code == 422
@@ -0,0 +1,31 @@
+"""
+Test that SAM.gov request throttling holds across threads.
+"""
+import threading
+import time
+
+import sam_client
+
+
+def test_concurrent_requests_are_spaced(monkeypatch):
+    """Test that two concurrent callers still go out at least the minimum interval apart"""
+    monkeypatch.setattr(sam_client, "_min_request_interval", 0.2)
+    monkeypatch.setattr(sam_client, "_last_request_time", 0)
+
+    start = threading.Barrier(2)
+    released = []
+
+    def call():
+        start.wait()
+        sam_client._throttle_request()
+        released.append(time.time())
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    first, second = sorted(released)
+    # Small tolerance for clock granularity
+    assert second - first >= sam_client._min_request_interval - 0.01